@@ -0,0 +1,105 @@
+import attack_tables
+import bitboard
+
+
+def _targets(mask):
+    return [bitboard.SQUARE_INDEX[square] for square in bitboard.squares(mask)]
+
+
+KNIGHT_TARGETS = [_targets(mask) for mask in attack_tables.KNIGHT_ATTACKS]
+KING_TARGETS = [_targets(mask) for mask in attack_tables.KING_ATTACKS]
+PAWN_TARGETS = [[_targets(mask) for mask in masks] for masks in attack_tables.PAWN_ATTACKS]
+
+ORTHOGONAL_SLIDERS = "RQrq"
+DIAGONAL_SLIDERS = "BQbq"
+OPPOSITE_DIRECTIONS = {direction: (-direction[0], -direction[1]) for direction in attack_tables.DIRECTIONS}
+
+
+class AttackMap():
+    def __init__(self, configuration=None, version=None):
+        self.mailbox = [None] * 64
+        self.counts = [[0] * 64, [0] * 64]
+        self.version = version
+        if configuration is not None:
+            self.rebuild(configuration, version)
+
+    def rebuild(self, configuration, version=None):
+        self.mailbox = [None] * 64
+        for square, piece in configuration.items():
+            if piece is not None:
+                self.mailbox[bitboard.SQUARE_INDEX[square]] = piece
+        self.counts = [[0] * 64, [0] * 64]
+        for index, piece in enumerate(self.mailbox):
+            if piece is not None:
+                self._add_piece(index, piece, 1)
+        self.version = version
+
+    def is_attacked(self, index, color) -> bool:
+        return self.counts[color][index] > 0
+
+    def get_attack_count(self, index, color) -> int:
+        return self.counts[color][index]
+
+    def update(self, index, piece):
+        previous = self.mailbox[index]
+        if previous == piece:
+            return
+        # sliders seeing this square attack further when it empties and stop here when it fills
+        sliders = self._get_sliders_seeing(index)
+        for slider_index, direction in sliders:
+            self._add_ray(index, direction, bitboard.color_of(self.mailbox[slider_index]), -1)
+        if previous is not None:
+            self._add_piece(index, previous, -1)
+        self.mailbox[index] = piece
+        if piece is not None:
+            self._add_piece(index, piece, 1)
+        for slider_index, direction in sliders:
+            self._add_ray(index, direction, bitboard.color_of(self.mailbox[slider_index]), 1)
+
+    def _get_sliders_seeing(self, index):
+        sliders = []
+        for direction in attack_tables.DIRECTIONS:
+            for target in attack_tables.RAYS[direction][index]:
+                piece = self.mailbox[target]
+                if piece is None:
+                    continue
+                slider_types = ORTHOGONAL_SLIDERS if direction in attack_tables.ORTHOGONAL_DIRECTIONS else DIAGONAL_SLIDERS
+                if piece in slider_types:
+                    sliders.append((target, OPPOSITE_DIRECTIONS[direction]))
+                break
+        return sliders
+
+    def _add_ray(self, index, direction, color, delta):
+        # squares attacked past index, which only exist while index is empty
+        if self.mailbox[index] is not None:
+            return
+        counts = self.counts[color]
+        for target in attack_tables.RAYS[direction][index]:
+            counts[target] += delta
+            if self.mailbox[target] is not None:
+                break
+
+    def _add_piece(self, index, piece, delta):
+        color = bitboard.color_of(piece)
+        counts = self.counts[color]
+        piece_type = piece.upper()
+        if piece_type == "P":
+            targets = PAWN_TARGETS[color][index]
+        elif piece_type == "N":
+            targets = KNIGHT_TARGETS[index]
+        elif piece_type == "K":
+            targets = KING_TARGETS[index]
+        else:
+            targets = []
+            directions = attack_tables.DIRECTIONS
+            if piece_type == "R":
+                directions = attack_tables.ORTHOGONAL_DIRECTIONS
+            if piece_type == "B":
+                directions = attack_tables.DIAGONAL_DIRECTIONS
+            for direction in directions:
+                for target in attack_tables.RAYS[direction][index]:
+                    targets.append(target)
+                    if self.mailbox[target] is not None:
+                        break
+        for target in targets:
+            counts[target] += delta
@@ -0,0 +1,103 @@
+import bitboard
+
+SQUARES = bitboard.SQUARES
+SQUARE_INDEX = bitboard.SQUARE_INDEX
+
+# Directions are (file step, row step) with row steps going towards the 8th row
+ORTHOGONAL_DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+DIAGONAL_DIRECTIONS = [(1, 1), (-1, 1), (1, -1), (-1, -1)]
+DIRECTIONS = ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS
+
+
+def _ray(index, direction):
+    file, row = index % 8, index // 8
+    file_step, row_step = direction
+    ray = []
+    file += file_step
+    row += row_step
+    while 0 <= file < 8 and 0 <= row < 8:
+        ray.append(row * 8 + file)
+        file += file_step
+        row += row_step
+    return ray
+
+
+def _mask(indexes):
+    mask = 0
+    for index in indexes:
+        mask |= 1 << index
+    return mask
+
+
+def _names(mask):
+    return bitboard.squares(mask)
+
+
+KNIGHT_ATTACKS = [bitboard.knight_attacks(1 << index) for index in range(64)]
+KING_ATTACKS = [bitboard.king_attacks(1 << index) for index in range(64)]
+PAWN_ATTACKS = [
+    [bitboard.pawn_attacks(1 << index, color) for index in range(64)]
+    for color in (bitboard.WHITE, bitboard.BLACK)
+]
+
+# Squares in the order they are met when sliding away from the origin square
+RAYS = {direction: [_ray(index, direction) for index in range(64)] for direction in DIRECTIONS}
+RAY_MASKS = {direction: [_mask(ray) for ray in rays] for direction, rays in RAYS.items()}
+
+# Every square between two aligned squares (exclusive), and the full line through them
+BETWEEN = [[0] * 64 for _ in range(64)]
+LINE = [[0] * 64 for _ in range(64)]
+for _direction, _rays in RAYS.items():
+    _opposite = (-_direction[0], -_direction[1])
+    for _origin in range(64):
+        _between = 0
+        for _target in _rays[_origin]:
+            BETWEEN[_origin][_target] = _between
+            LINE[_origin][_target] = RAY_MASKS[_direction][_origin] | RAY_MASKS[_opposite][_origin] | 1 << _origin
+            _between |= 1 << _target
+
+KNIGHT_SQUARES = {SQUARES[index]: _names(KNIGHT_ATTACKS[index]) for index in range(64)}
+KING_SQUARES = {SQUARES[index]: _names(KING_ATTACKS[index]) for index in range(64)}
+PAWN_ATTACK_SQUARES = [
+    {SQUARES[index]: _names(PAWN_ATTACKS[color][index]) for index in range(64)}
+    for color in (bitboard.WHITE, bitboard.BLACK)
+]
+RAY_SQUARES = {
+    direction: {SQUARES[index]: [SQUARES[target] for target in rays[index]] for index in range(64)}
+    for direction, rays in RAYS.items()
+}
+
+
+def _is_positive(direction):
+    file_step, row_step = direction
+    return row_step > 0 or (row_step == 0 and file_step > 0)
+
+
+def ray_attacks(index, occupied, direction):
+    ray = RAY_MASKS[direction][index]
+    blockers = ray & occupied
+    if not blockers:
+        return ray
+    if _is_positive(direction):
+        blocker = (blockers & -blockers).bit_length() - 1
+    else:
+        blocker = blockers.bit_length() - 1
+    return ray ^ RAY_MASKS[direction][blocker]
+
+
+def rook_attacks(index, occupied):
+    attacks = 0
+    for direction in ORTHOGONAL_DIRECTIONS:
+        attacks |= ray_attacks(index, occupied, direction)
+    return attacks
+
+
+def bishop_attacks(index, occupied):
+    attacks = 0
+    for direction in DIAGONAL_DIRECTIONS:
+        attacks |= ray_attacks(index, occupied, direction)
+    return attacks
+
+
+def queen_attacks(index, occupied):
+    return rook_attacks(index, occupied) | bishop_attacks(index, occupied)
@@ -0,0 +1,86 @@
+import argparse
+import sys
+import time
+import chessboard
+import perft
+import search
+
+'''
+Benchmarks of the engine building blocks
+
+Usage: python benchmark.py ordering [--depth N] [--position NAME ...] [--backend BACKEND]
+       python benchmark.py fen [--count N] [--backend BACKEND]
+'''
+
+
+def compare_ordering(fen, depth, backend=chessboard.ChessBoard.BITBOARD_BACKEND):
+    # (unordered result, ordered result) of the same fixed depth search
+    results = []
+    for ordering in (False, True):
+        board = perft.create_board(fen, backend)
+        results.append(search.Searcher(board, max_depth=depth, ordering=ordering).search())
+    return results[0], results[1]
+
+
+def get_node_reduction(unordered_nodes, ordered_nodes):
+    if unordered_nodes == 0:
+        return 0.0
+    return 100.0 * (unordered_nodes - ordered_nodes) / unordered_nodes
+
+
+def run_ordering(arguments):
+    total_unordered = 0
+    total_ordered = 0
+    for position in arguments.position:
+        unordered, ordered = compare_ordering(perft.POSITIONS[position][0], arguments.depth, arguments.backend)
+        total_unordered += unordered.nodes
+        total_ordered += ordered.nodes
+        reduction = get_node_reduction(unordered.nodes, ordered.nodes)
+        print(f"{position}: unordered {unordered.nodes} nodes {unordered.seconds:.2f}s, ordered {ordered.nodes} nodes {ordered.seconds:.2f}s, reduction {reduction:.1f}%")
+    print(f"Total: unordered {total_unordered} nodes, ordered {total_ordered} nodes, reduction {get_node_reduction(total_unordered, total_ordered):.1f}%")
+    return 0
+
+
+def measure_fen(fens, count, backend=chessboard.ChessBoard.DICT_BACKEND):
+    # (FENs loaded per second, FENs written per second) reusing one board
+    board = chessboard.ChessBoard(0, backend=backend)
+    start = time.perf_counter()
+    for index in range(count):
+        board.set_fen(fens[index % len(fens)])
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(count):
+        board.to_fen()
+    write_seconds = time.perf_counter() - start
+    return count / load_seconds, count / write_seconds
+
+
+def run_fen(arguments):
+    fens = [fen for fen, _ in perft.POSITIONS.values()]
+    for backend in arguments.backend:
+        loaded, written = measure_fen(fens, arguments.count, backend)
+        print(f"{backend}: set_fen {loaded:.0f} FEN/s, to_fen {written:.0f} FEN/s")
+    return 0
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine building blocks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    ordering = subparsers.add_parser("ordering", help="search nodes with and without move ordering")
+    ordering.add_argument("--depth", type=int, default=4)
+    ordering.add_argument("--position", choices=sorted(perft.POSITIONS), nargs="+", default=sorted(perft.POSITIONS))
+    ordering.add_argument("--backend", choices=chessboard.ChessBoard.BACKENDS, default=chessboard.ChessBoard.BITBOARD_BACKEND)
+    ordering.set_defaults(run=run_ordering)
+
+    fen = subparsers.add_parser("fen", help="FEN parsing and writing speed")
+    fen.add_argument("--count", type=int, default=10000)
+    fen.add_argument("--backend", choices=chessboard.ChessBoard.BACKENDS, nargs="+", default=chessboard.ChessBoard.BACKENDS)
+    fen.set_defaults(run=run_fen)
+
+    arguments = parser.parse_args(arguments)
+    return arguments.run(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
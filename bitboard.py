@@ -0,0 +1,167 @@
+WHITE = 0
+BLACK = 1
+
+FULL = 0xFFFFFFFFFFFFFFFF
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F
+NOT_AB_FILES = 0xFCFCFCFCFCFCFCFC
+NOT_GH_FILES = 0x3F3F3F3F3F3F3F3F
+
+# Squares are indexed from a1 (0) to h8 (63), file first
+SQUARES = [file + rank for rank in "12345678" for file in "abcdefgh"]
+SQUARE_INDEX = {square: index for index, square in enumerate(SQUARES)}
+
+# White pieces use indexes 0-5, black pieces 6-11
+PIECE_CHARACTERS = "PNBRQKpnbrqk"
+PIECE_INDEX = {piece: index for index, piece in enumerate(PIECE_CHARACTERS)}
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# (shift amount, mask removing the squares that wrapped around the board)
+NORTH = (8, FULL)
+SOUTH = (-8, FULL)
+EAST = (1, NOT_A_FILE)
+WEST = (-1, NOT_H_FILE)
+NORTH_EAST = (9, NOT_A_FILE)
+NORTH_WEST = (7, NOT_H_FILE)
+SOUTH_EAST = (-7, NOT_A_FILE)
+SOUTH_WEST = (-9, NOT_H_FILE)
+
+ORTHOGONAL_DIRECTIONS = [NORTH, SOUTH, EAST, WEST]
+DIAGONAL_DIRECTIONS = [NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST]
+
+
+def color_of(piece):
+    return WHITE if piece.isupper() else BLACK
+
+
+def shift(bitboard, direction):
+    amount, mask = direction
+    if amount > 0:
+        return (bitboard << amount) & mask & FULL
+    return (bitboard >> -amount) & mask
+
+
+def sliding_attacks(sliders, empty, direction):
+    # Dumb7fill: flood the sliders through empty squares, then one more step to include the blockers
+    flood = sliders
+    sliders = shift(sliders, direction) & empty
+    while sliders:
+        flood |= sliders
+        sliders = shift(sliders, direction) & empty
+    return shift(flood, direction)
+
+
+def pawn_attacks(pawns, color):
+    if color == WHITE:
+        return ((pawns << 9) & NOT_A_FILE | (pawns << 7) & NOT_H_FILE) & FULL
+    return (pawns >> 7) & NOT_A_FILE | (pawns >> 9) & NOT_H_FILE
+
+
+def knight_attacks(knights):
+    attacks = (knights << 17) & NOT_A_FILE | (knights << 15) & NOT_H_FILE
+    attacks |= (knights << 10) & NOT_AB_FILES | (knights << 6) & NOT_GH_FILES
+    attacks |= (knights >> 17) & NOT_H_FILE | (knights >> 15) & NOT_A_FILE
+    attacks |= (knights >> 10) & NOT_GH_FILES | (knights >> 6) & NOT_AB_FILES
+    return attacks & FULL
+
+
+def king_attacks(kings):
+    attacks = shift(kings, EAST) | shift(kings, WEST)
+    kings |= attacks
+    attacks |= shift(kings, NORTH) | shift(kings, SOUTH)
+    return attacks
+
+
+def squares(bitboard):
+    names = []
+    while bitboard:
+        lowest = bitboard & -bitboard
+        names.append(SQUARES[lowest.bit_length() - 1])
+        bitboard ^= lowest
+    return names
+
+
+class BitboardPosition():
+    def __init__(self, configuration=None):
+        self.bitboards = [0] * 12
+        self.occupancy = [0, 0]
+        self.occupied = 0
+        self.mailbox = [None] * 64
+        self.version = 0
+        if configuration is not None:
+            for square, piece in configuration.items():
+                if piece is not None:
+                    self[square] = piece
+
+    def get(self, square, default=None):
+        index = SQUARE_INDEX.get(square)
+        if index is None:
+            return default
+        piece = self.mailbox[index]
+        return default if piece is None else piece
+
+    def __getitem__(self, square):
+        return self.mailbox[SQUARE_INDEX[square]]
+
+    def __setitem__(self, square, piece):
+        index = SQUARE_INDEX[square]
+        bit = 1 << index
+        previous = self.mailbox[index]
+        if previous is not None:
+            self.bitboards[PIECE_INDEX[previous]] ^= bit
+            self.occupancy[color_of(previous)] ^= bit
+            self.occupied ^= bit
+        self.mailbox[index] = piece
+        if piece is not None:
+            self.bitboards[PIECE_INDEX[piece]] |= bit
+            self.occupancy[color_of(piece)] |= bit
+            self.occupied |= bit
+        self.version += 1
+
+    def __delitem__(self, square):
+        self[square] = None
+
+    def __contains__(self, square):
+        return self.get(square) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return bin(self.occupied).count("1")
+
+    def keys(self):
+        return squares(self.occupied)
+
+    def values(self):
+        return [self.mailbox[SQUARE_INDEX[square]] for square in self.keys()]
+
+    def items(self):
+        return [(square, self.mailbox[SQUARE_INDEX[square]]) for square in self.keys()]
+
+    def pieces(self, piece, color):
+        return self.bitboards[piece + 6 * color]
+
+    def attacks(self, color, occupied=None):
+        if occupied is None:
+            occupied = self.occupied
+        empty = ~occupied & FULL
+        attacks = pawn_attacks(self.pieces(PAWN, color), color)
+        attacks |= knight_attacks(self.pieces(KNIGHT, color))
+        attacks |= king_attacks(self.pieces(KING, color))
+        queens = self.pieces(QUEEN, color)
+        rooks = self.pieces(ROOK, color) | queens
+        bishops = self.pieces(BISHOP, color) | queens
+        if rooks:
+            for direction in ORTHOGONAL_DIRECTIONS:
+                attacks |= sliding_attacks(rooks, empty, direction)
+        if bishops:
+            for direction in DIAGONAL_DIRECTIONS:
+                attacks |= sliding_attacks(bishops, empty, direction)
+        return attacks
+
+    def __str__(self) -> str:
+        return f"{dict(self.items())}"
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -1,7 +1,16 @@
 import pygame
+import attack_map
+import attack_tables
+import bitboard
 import board
 import colors
+import configuration
+import evaluation
+import fen as fen_codec
 import move
+import move_cache
+import movegen
+import zobrist
 
 class ChessBoard(board.Board):
 
@@ -45,87 +54,73 @@ class ChessBoard(board.Board):
         PAWN : "♙"
     }
 
+    DICT_BACKEND = "dict"
+    BITBOARD_BACKEND = "bitboard"
+    BACKENDS = [DICT_BACKEND, BITBOARD_BACKEND]
+
     __DEFAULT_FEN_END = " w KQkq - 0 1"
     __STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR" + __DEFAULT_FEN_END
 
-    def __init__(self, square_size, fen=None) -> None:
+    def __init__(self, square_size, fen=None, backend=DICT_BACKEND, move_cache_size=0) -> None:
         board.Board.__init__(self, 8, 8, square_size)
+        if backend not in self.BACKENDS:
+            raise Exception(f"Unknown backend: {backend}")
+        self.backend = backend
         if not fen:
             fen = self.__STARTING_FEN
-        self.configuration = self.from_fen(fen)
-        self.current_player = self.LIGHT_PLAYER
-        self.has_white_king_moved = False
-        self.has_black_king_moved = False
-        self.has_white_short_castle_rook_moved = False
-        self.has_white_long_castle_rook_moved = False
-        self.has_black_short_castle_rook_moved = False
-        self.has_black_long_castle_rook_moved = False
-
-        self.white_en_passant_target_file = None
-        self.black_en_passant_target_file = None
         self.white_en_passant_pawn = None
         self.black_en_passant_pawn = None
-
-        self.moves = []
+        self.set_fen(fen)
+        # opt-in: the key covers pieces, side to move, castling and en passant, so moves and switch_player miss it
+        self.move_cache = move_cache.LegalMoveCache(move_cache_size) if move_cache_size else None
 
     def get_default_fen_end(self):
         return self.__DEFAULT_FEN_END
     
-    def next_square(self, file, row):
-        file += 1
-        if file == 8:
-            file = 0
-            row += 1
-        return file, row
-    
     def from_fen(self, fen : str):
-        fen_configuration = {}
-        fens = fen.split(" ")
-        position = fens[0]
-        lines = position.split("/")
-        current_row = 0
-        current_file = 0
-        for i, line in enumerate(lines):
-            contents = [character for character in line]
-            for piece in contents:
-                if piece.isalnum():
-                    if piece.isalpha():
-                        square = self.get_file(current_file) + self.get_row(current_row)
-                        fen_configuration[square] = piece
-                        current_file, current_row = self.next_square(current_file, current_row)
-                    else:
-                        number_of_empty_squares = int(piece)
-                        for _ in range(number_of_empty_squares):
-                            current_file, current_row = self.next_square(current_file, current_row)
-                else:
-                    raise Exception(f"Unexpected fen content: {piece} in {contents}")
+        # the piece placement only, see set_fen for the whole position
+        return self.create_configuration(fen_codec.parse_placement(fen.split(" ")[0]))
+
+    def create_configuration(self, placement):
+        if self.backend == self.BITBOARD_BACKEND:
+            fen_configuration = bitboard.BitboardPosition(placement)
+        else:
+            fen_configuration = configuration.Configuration(placement)
+        self.piece_key = zobrist.compute_piece_key(fen_configuration)
+        self.piece_key_version = fen_configuration.version
+        self.evaluation = evaluation.Evaluation(fen_configuration, fen_configuration.version)
         return fen_configuration
 
-    def get_fen_row(self, row):
-        fen_row = ""
-        empty_squares = 0
-        for file in range(8):
-            piece = self.get_piece(self.get_file(file)+str(8-row+1))
-            if piece == None:
-                empty_squares += 1
-            else:
-                if empty_squares > 0:
-                    fen_row += str(empty_squares)
-                    empty_squares = 0
-                fen_row += piece
-            # Handle line without a piece
-            if file == 7 and empty_squares > 0:
-                fen_row += str(empty_squares)
-        return fen_row
+    def set_fen(self, fen : str):
+        # replaces the whole position: pieces, side to move, castling, en passant and clocks
+        placement, is_white_to_move, castling_rights, en_passant, halfmove_clock, fullmove_number = fen_codec.parse(fen)
+        self.configuration = self.create_configuration(placement)
+        self.current_player = self.LIGHT_PLAYER if is_white_to_move else self.DARK_PLAYER
+        self.has_white_king_moved = False
+        self.has_black_king_moved = False
+        self.has_white_short_castle_rook_moved = not castling_rights[0]
+        self.has_white_long_castle_rook_moved = not castling_rights[1]
+        self.has_black_short_castle_rook_moved = not castling_rights[2]
+        self.has_black_long_castle_rook_moved = not castling_rights[3]
+        # the en passant square belongs to the side to move
+        en_passant_file = None if en_passant is None else self.convert(en_passant[0])
+        self.white_en_passant_target_file = en_passant_file if is_white_to_move else None
+        self.black_en_passant_target_file = None if is_white_to_move else en_passant_file
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.moves = []
+        self.undo_stack = []
+        self.attack_map = None
 
     def to_fen(self) -> str:
-        fen = ""
-        for i in range(8):
-            row = self.get_fen_row(i+1)
-            fen += row
-            if i < self.columns - 1:
-                fen += "/"
-        return fen + self.get_default_fen_end()
+        is_white_to_move = self.current_player == self.LIGHT_PLAYER
+        en_passant = None
+        if is_white_to_move and self.white_en_passant_target_file is not None:
+            en_passant = self.get_file(self.white_en_passant_target_file) + "6"
+        elif not is_white_to_move and self.black_en_passant_target_file is not None:
+            en_passant = self.get_file(self.black_en_passant_target_file) + "3"
+        fields = fen_codec.format_fields(is_white_to_move, self.get_castling_rights(), en_passant, self.halfmove_clock, self.fullmove_number)
+        return fen_codec.format_placement(self.configuration) + " " + fields
     
     def get_row(self, row):
         return str(8 - row)
@@ -246,7 +241,8 @@ class ChessBoard(board.Board):
         is_black_starting_position = row == 7 and not is_white_player
         direction = self.get_direction(square)
         if not self.is_pawn_stuck(square):
-            if is_white_starting_position or is_black_starting_position:
+            # the double step cannot jump over a piece of the same player either
+            if (is_white_starting_position or is_black_starting_position) and self.configuration.get(f"{file}{row+1*direction}") is None:
                 legal_moves.append(f"{file}{row+2*direction}")
             if 0 < row+1*direction <= 8:
                 legal_moves.append(f"{file}{row+1*direction}")
@@ -276,25 +272,16 @@ class ChessBoard(board.Board):
 
     def get_knight_moves(self, square, file_move, row_move):
         legal_moves = []
-        for _ in range(2):
-            for _ in range(2):
-                column, line = self.from_square(square)
-                if 0 <= line + row_move < 8:
-                    target_square = self.to_square(column + file_move, line + row_move)
-                    if self.is_on_board(target_square):
-                        legal_moves.append(target_square)
-                row_move *= -1
-                if row_move > 0:
-                    file_move *= -1
+        for target_square in attack_tables.KNIGHT_SQUARES[square]:
+            if abs(ord(target_square[0]) - ord(square[0])) == abs(file_move):
+                legal_moves.append(target_square)
         return legal_moves
     
     def get_knight_legal_moves(self, square:str):
-        moves = []
-        moves.extend(self.get_knight_moves(square, 2, 1))
-        moves.extend(self.get_knight_moves(square, 1, 2))
         legal_moves = []
-        for move in moves:
-            if self.configuration.get(move) is None or self.get_player_from_square(move) != self.current_player:
+        for move in attack_tables.KNIGHT_SQUARES[square]:
+            piece = self.configuration.get(move)
+            if piece is None or self.get_position_player(piece) != self.current_player:
                 legal_moves.append(move)
         return legal_moves
 
@@ -308,87 +295,127 @@ class ChessBoard(board.Board):
         legal_moves.extend(self.get_rook_legal_moves(square))
         return legal_moves
 
-    def get_attackers(self, square:str):
-        possible_attackers = []
-        possible_attackers.extend(self.get_squares_ahead(square, -1, -1))
-        possible_attackers.extend(self.get_squares_ahead(square, -1, 0))
-        possible_attackers.extend(self.get_squares_ahead(square, -1, 1))
-        possible_attackers.extend(self.get_squares_ahead(square, 0, -1))
-        possible_attackers.extend(self.get_squares_ahead(square, 0, 1))
-        possible_attackers.extend(self.get_squares_ahead(square, 1, -1))
-        possible_attackers.extend(self.get_squares_ahead(square, 1, 0))
-        possible_attackers.extend(self.get_squares_ahead(square, 1, 1))
+    def get_attackers(self, square:str, attacking_player=None):
+        if attacking_player is None:
+            attacking_player = self.get_other_player(self.current_player)
         attackers = []
-        for possible_attacker in possible_attackers:
-            if self.get_piece(possible_attacker) is not None and self.get_player_from_square(possible_attacker) != self.current_player:
-                legal_moves = self.get_legal_moves(self.get_piece(possible_attacker), possible_attacker)
-                if square in legal_moves:
-                    attackers.append(possible_attacker)
+        for direction in attack_tables.DIRECTIONS:
+            sliders = self.ROOK + self.QUEEN
+            if direction in attack_tables.DIAGONAL_DIRECTIONS:
+                sliders = self.BISHOP + self.QUEEN
+            for square_ahead in attack_tables.RAY_SQUARES[direction][square]:
+                piece = self.configuration.get(square_ahead)
+                if piece is None:
+                    continue
+                if piece.upper() in sliders and self.get_position_player(piece) == attacking_player:
+                    attackers.append(square_ahead)
+                break
+        for knight_square in attack_tables.KNIGHT_SQUARES[square]:
+            piece = self.configuration.get(knight_square)
+            if piece is not None and piece.upper() == self.KNIGHT and self.get_position_player(piece) == attacking_player:
+                attackers.append(knight_square)
+        for king_square in attack_tables.KING_SQUARES[square]:
+            piece = self.configuration.get(king_square)
+            if piece is not None and piece.upper() == self.KING and self.get_position_player(piece) == attacking_player:
+                attackers.append(king_square)
+        # a pawn attacks the square if a pawn of the other color standing there would attack the pawn
+        defending_color = bitboard.BLACK if attacking_player == self.LIGHT_PLAYER else bitboard.WHITE
+        for pawn_square in attack_tables.PAWN_ATTACK_SQUARES[defending_color][square]:
+            piece = self.configuration.get(pawn_square)
+            if piece is not None and piece.upper() == self.PAWN and self.get_position_player(piece) == attacking_player:
+                attackers.append(pawn_square)
         return attackers
     
-    def is_attacked(self, square:str) -> bool:
-        return len(self.get_attackers(square)) > 0
+    def get_bitboard_position(self) -> bitboard.BitboardPosition:
+        if self.backend == self.BITBOARD_BACKEND:
+            return self.configuration
+        return bitboard.BitboardPosition(self.configuration)
+
+    def get_attack_mask(self, player) -> int:
+        return self.get_bitboard_position().attacks(self.get_player_index(player))
+
+    def get_attacked_squares(self, player) -> [str]:
+        return bitboard.squares(self.get_attack_mask(player))
+
+    def get_attack_map(self) -> attack_map.AttackMap:
+        # the map follows moves incrementally and is rebuilt after any direct configuration change
+        if self.attack_map is None:
+            self.attack_map = attack_map.AttackMap(self.configuration, self.configuration.version)
+        elif self.attack_map.version != self.configuration.version:
+            self.attack_map.rebuild(self.configuration, self.configuration.version)
+        return self.attack_map
+
+    def get_player_index(self, player):
+        return bitboard.WHITE if player == self.LIGHT_PLAYER else bitboard.BLACK
+
+    def is_attacked(self, square:str, attacking_player=None) -> bool:
+        if attacking_player is None:
+            attacking_player = self.get_other_player(self.current_player)
+        return self.get_attack_map().is_attacked(bitboard.SQUARE_INDEX[square], self.get_player_index(attacking_player))
     
     def get_king_legal_moves(self, king_square:str):
-        moves = []
-        moves.extend(self.get_squares_ahead(king_square, -1, 1, limit=1))
-        moves.extend(self.get_squares_ahead(king_square, -1, 0, limit=1))
-        moves.extend(self.get_squares_ahead(king_square, -1, -1, limit=1))
-        moves.extend(self.get_squares_ahead(king_square, 0, -1, limit=1))
-        moves.extend(self.get_squares_ahead(king_square, 0, 1, limit=1))
-        moves.extend(self.get_squares_ahead(king_square, 1, -1, limit=1))
-        moves.extend(self.get_squares_ahead(king_square, 1, 0, limit=1))
-        moves.extend(self.get_squares_ahead(king_square, 1, 1, limit=1))
         possible_moves = []
-        for move in moves:
-            if self.configuration.get(move) is None or self.get_player_from_square(move) != self.current_player:
+        for move in attack_tables.KING_SQUARES[king_square]:
+            piece = self.configuration.get(move)
+            if piece is None or self.get_position_player(piece) != self.current_player:
                 possible_moves.append(move)
         legal_moves = []
-        king = self.get_piece(king_square)
-        if len(possible_moves) > 0:
-            for possible_move in possible_moves:
-                piece = self.get_piece(possible_move)
-                self.move(king_square, possible_move)
-                if not self.is_attacked(possible_move):
-                    legal_moves.append(possible_move)
-                self.move(possible_move, king_square)
-                self.configuration[possible_move] = piece
-            self.configuration[king_square] = king
+        attacking_player = self.get_other_player(self.get_player_from_square(king_square))
+        for possible_move in possible_moves:
+            self.make_move(king_square, possible_move)
+            if not self.is_attacked(possible_move, attacking_player):
+                legal_moves.append(possible_move)
+            self.unmake_move()
         return legal_moves
 
+    def can_castle(self, king_square, rook_file):
+        king = self.configuration.get(king_square)
+        if king is None or king.upper() != self.KING:
+            return False
+        player = self.get_position_player(king)
+        if player == self.LIGHT_PLAYER:
+            row = "1"
+            if self.has_white_king_moved:
+                return False
+            rook_moved = self.has_white_short_castle_rook_moved if rook_file == "h" else self.has_white_long_castle_rook_moved
+        else:
+            row = "8"
+            if self.has_black_king_moved:
+                return False
+            rook_moved = self.has_black_short_castle_rook_moved if rook_file == "h" else self.has_black_long_castle_rook_moved
+        rook = self.configuration.get(rook_file + row)
+        if rook_moved or king_square != "e" + row or rook is None or rook != (self.ROOK if player == self.LIGHT_PLAYER else self.ROOK.lower()):
+            return False
+        # castling out of check is not allowed
+        return not self.is_attacked(king_square, self.get_other_player(player))
+
     def get_short_castle_move(self, square):
-        if self.has_white_king_moved or self.has_white_short_castle_rook_moved:
+        if not self.can_castle(square, "h"):
             return []
-        if self.current_player == self.LIGHT_PLAYER:
-            squares_to_check_if_empty = ["f1", "g1"]
-        else:
-            squares_to_check_if_empty = ["f8", "g8"]
+        row = square[1]
+        attacking_player = self.get_other_player(self.get_player_from_square(square))
+        squares_to_check_if_empty = ["f" + row, "g" + row]
         for square_to_check in squares_to_check_if_empty:
             if self.configuration.get(square_to_check) != None:
                 return []
-            if self.is_attacked(square_to_check):
+            if self.is_attacked(square_to_check, attacking_player):
                 return []
-        if self.current_player == self.LIGHT_PLAYER:
-            return ["g1"]
-        else:
-            return ["g8"]
+        return ["g" + row]
     
     def get_long_castle_move(self, square):
-        if self.has_white_king_moved or self.has_white_long_castle_rook_moved:
+        if not self.can_castle(square, "a"):
             return []
-        if self.current_player == self.LIGHT_PLAYER:
-            squares_to_check_if_empty = ["b1", "c1", "d1"]
-        else:
-            squares_to_check_if_empty = ["b8", "c8", "d8"]
+        row = square[1]
+        attacking_player = self.get_other_player(self.get_player_from_square(square))
+        squares_to_check_if_empty = ["b" + row, "c" + row, "d" + row]
         for square_to_check in squares_to_check_if_empty:
             if self.configuration.get(square_to_check) != None:
                 return []
-            if self.is_attacked(square_to_check):
+        # the king does not cross b1/b8, so only c and d files must be safe
+        for square_to_check in squares_to_check_if_empty[1:]:
+            if self.is_attacked(square_to_check, attacking_player):
                 return []
-        if self.current_player == self.LIGHT_PLAYER:
-            return ["c1"]
-        else:
-            return ["c8"]
+        return ["c" + row]
     
     def from_square(self, square:str):
         column = self.convert(square[0])
@@ -407,22 +434,13 @@ class ChessBoard(board.Board):
 
     def get_squares_ahead(self, square, direction_x, direction_y, limit = None):
         squares_ahead = []
-        column, line = self.from_square(square)
-        while True:
-            column += direction_x
-            line -= direction_y
-            square_ahead = self.to_square(column, line)
-            if not self.is_on_board(square_ahead):
-                break
-            if self.configuration.get(square_ahead) is None:
+        for square_ahead in attack_tables.RAY_SQUARES[(direction_x, direction_y)][square]:
+            piece_ahead = self.configuration.get(square_ahead)
+            if piece_ahead is None:
                 squares_ahead.append(square_ahead)
             else:
-                squares_ahead_player = self.get_player_from_square(square_ahead)
                 piece = self.get_piece(square)
-                piece_ahead = self.get_piece(square_ahead)
-                if piece_ahead is None:
-                    squares_ahead.append(square_ahead)
-                if squares_ahead_player is not None and (piece is None or squares_ahead_player != self.get_player_from_square(square)):
+                if piece is None or self.get_position_player(piece_ahead) != self.get_position_player(piece):
                     squares_ahead.append(square_ahead)
                 break
             if limit is not None:
@@ -438,33 +456,16 @@ class ChessBoard(board.Board):
     def get_pieces_attacked_by(self, square:str) -> [str]:
         attacked_pieces = []
         piece = self.get_piece(square)
-        column, row = self.get_board_coordinates(square)
-        attackable_squares = []
-        direction = -1 if piece.isupper() else 1
-        attacking_player = self.get_player_from_square(square)
+        attacking_player = self.get_position_player(piece)
         if piece.lower() == "p":
-            attack_directions = [(-1, direction), (1, direction)]
-            attack_range = 1
+            attackable_squares = attack_tables.PAWN_ATTACK_SQUARES[self.get_player_index(attacking_player)][square]
         if piece.lower() == "k":
-            attack_directions = [
-                (1,  -1), (1,  0), (1,  1),
-                (0,  -1),          (0,  1), 
-                (-1, -1), (-1, 0), (-1, 1)
-            ]
-            attack_range = 1
-
-        for i in range(attack_range):
-            for attack_direction in attack_directions:
-                attackable_square = (column + attack_direction[0] * (i + 1), row + attack_direction[1] * (i + 1))
-                attackable_squares.append(attackable_square)
-        for attackable_square in attackable_squares:
-            target_square = self.get_file(attackable_square[0]) + self.get_row(attackable_square[1])
-            piece = self.get_piece(target_square)
-            if piece is not None:
-                piece_player = self.get_player_from_square(target_square)
-                other_player = self.get_other_player(attacking_player)
-                if piece_player == other_player:
-                    attacked_pieces.append(target_square)
+            attackable_squares = attack_tables.KING_SQUARES[square]
+        other_player = self.get_other_player(attacking_player)
+        for target_square in attackable_squares:
+            piece = self.configuration.get(target_square)
+            if piece is not None and self.get_position_player(piece) == other_player:
+                attacked_pieces.append(target_square)
         return attacked_pieces
 
     def get_player_from_square(self, square):
@@ -473,103 +474,251 @@ class ChessBoard(board.Board):
             raise Exception(f"square {square} is empty")
         return self.LIGHT_PLAYER if piece.isupper() else self.DARK_PLAYER
     
+    def get_en_passant_target_file(self, player):
+        if player == self.LIGHT_PLAYER:
+            return self.white_en_passant_target_file
+        return self.black_en_passant_target_file
+
+    def get_player_castling_rights(self, player):
+        castling_rights = self.get_castling_rights()
+        if player == self.LIGHT_PLAYER:
+            return castling_rights[:2]
+        return castling_rights[2:]
+
+    def generate_legal_targets(self, player, from_mask=bitboard.FULL):
+        return movegen.generate_legal_targets(
+            self.get_bitboard_position(),
+            self.get_player_index(player),
+            self.get_player_castling_rights(player),
+            self.get_en_passant_target_file(player),
+            from_mask,
+        )
+
+    def iter_legal_moves(self, player=None, from_mask=bitboard.FULL):
+        # lazy variant of generate_legal_moves, stops generating as soon as the caller stops iterating
+        if player is None:
+            player = self.current_player
+        return movegen.generate_legal_moves(
+            self.get_bitboard_position(),
+            self.get_player_index(player),
+            self.get_player_castling_rights(player),
+            self.get_en_passant_target_file(player),
+            from_mask,
+        )
+
+    def generate_legal_moves(self, player=None) -> [int]:
+        # every legal move of the player in one pass, packed as 16 bit integers (see move.encode)
+        return list(self.iter_legal_moves(player))
+
+    def has_legal_move(self, player=None) -> bool:
+        return next(self.iter_legal_moves(player), None) is not None
+
+    def make_encoded_move(self, encoded_move):
+        self.make_move(*move.get_squares(encoded_move))
+
     def get_legal_moves(self, piece:str, square):
+        # moves of the piece standing on square, for the player owning it
+        if self.move_cache is not None:
+            cache_key = (self.get_zobrist_key(), square)
+            cached_moves = self.move_cache.get(cache_key)
+            if cached_moves is not None:
+                return list(cached_moves)
+        player = self.get_player_from_square(square)
         legal_moves = []
-        piece = piece.upper()
-        if piece == self.PAWN:
-            legal_moves.extend(self.get_pawn_legal_moves(square))
-            legal_moves.extend(self.get_en_passant_move(square))
-        if piece == self.BISHOP:
-            legal_moves.extend(self.get_bishop_legal_moves(square))
-        if piece == self.KNIGHT:
-            legal_moves.extend(self.get_knight_legal_moves(square))
-        if piece == self.ROOK:
-            legal_moves.extend(self.get_rook_legal_moves(square))
-        if piece == self.QUEEN:
-            legal_moves.extend(self.get_queen_legal_moves(square))
-        if piece == self.KING:
-            legal_moves.extend(self.get_king_legal_moves(square))
-            legal_moves.extend(self.get_short_castle_move(square))
-            legal_moves.extend(self.get_long_castle_move(square))
+        for _, targets in self.generate_legal_targets(player, 1 << bitboard.SQUARE_INDEX[square]):
+            legal_moves.extend(bitboard.squares(targets))
+        if self.move_cache is not None:
+            self.move_cache.put(cache_key, legal_moves)
         return legal_moves
 
-    def move(self, from_square, to_square):
-        # self.draw_simple()
+    def move(self, from_square, to_square, promotion=None):
         piece = self.get_piece(from_square).upper()
         color = self.get_player_from_square(from_square)
-        # print(f"{color} moves {piece} from {from_square} to {to_square}")
         self.moves.extend([move.Move(color, piece, from_square, to_square)])
+        self._play(from_square, to_square, promotion)
+
+    def make_move(self, from_square, to_square, promotion=None):
+        # plays the move for the side to move without recording it in the game history
+        self.undo_stack.append(self._play(from_square, to_square, promotion))
+        self.switch_player()
+
+    def unmake_move(self):
+        from_square, to_square, piece, captured, captured_square, rook_from, rook_to, castling_flags, white_en_passant_target_file, black_en_passant_target_file, halfmove_clock, fullmove_number = self.undo_stack.pop()
+        self.switch_player()
+        if rook_from is not None:
+            self._set_square(rook_from, self.configuration.get(rook_to))
+            self._set_square(rook_to, None)
+        self._set_square(to_square, None)
+        if captured is not None:
+            self._set_square(captured_square, captured)
+        self._set_square(from_square, piece)
+        self.set_castling_flags(castling_flags)
+        self.white_en_passant_target_file = white_en_passant_target_file
+        self.black_en_passant_target_file = black_en_passant_target_file
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+
+    def get_castling_rights(self):
+        return (
+            not (self.has_white_king_moved or self.has_white_short_castle_rook_moved),
+            not (self.has_white_king_moved or self.has_white_long_castle_rook_moved),
+            not (self.has_black_king_moved or self.has_black_short_castle_rook_moved),
+            not (self.has_black_king_moved or self.has_black_long_castle_rook_moved),
+        )
+
+    def evaluate(self) -> int:
+        # material and piece-square score for the side to move, kept up to date by _set_square
+        if self.evaluation.version != self.configuration.version:
+            self.evaluation.rebuild(self.configuration, self.configuration.version)
+        score = self.evaluation.get_score()
+        return score if self.current_player == self.LIGHT_PLAYER else -score
+
+    def get_zobrist_key(self) -> int:
+        # pieces are hashed incrementally, side, castling and en passant are folded in on request
+        if self.piece_key_version != self.configuration.version:
+            self.piece_key = zobrist.compute_piece_key(self.configuration)
+            self.piece_key_version = self.configuration.version
+        return self.piece_key ^ zobrist.get_state_key(
+            self.current_player == self.DARK_PLAYER,
+            self.get_castling_rights(),
+            self.white_en_passant_target_file,
+            self.black_en_passant_target_file,
+        )
+
+    def get_castling_flags(self):
+        return (
+            self.has_white_king_moved,
+            self.has_black_king_moved,
+            self.has_white_short_castle_rook_moved,
+            self.has_white_long_castle_rook_moved,
+            self.has_black_short_castle_rook_moved,
+            self.has_black_long_castle_rook_moved,
+        )
+
+    def set_castling_flags(self, castling_flags):
+        (
+            self.has_white_king_moved,
+            self.has_black_king_moved,
+            self.has_white_short_castle_rook_moved,
+            self.has_white_long_castle_rook_moved,
+            self.has_black_short_castle_rook_moved,
+            self.has_black_long_castle_rook_moved,
+        ) = castling_flags
+
+    def _set_square(self, square, piece):
+        version = self.configuration.version
+        index = bitboard.SQUARE_INDEX[square]
+        previous = self.configuration.get(square)
+        self.configuration[square] = piece
+        if self.piece_key_version == version:
+            self.piece_key ^= zobrist.get_piece_key(previous, index) ^ zobrist.get_piece_key(piece, index)
+            self.piece_key_version = self.configuration.version
+        if self.evaluation.version == version:
+            self.evaluation.update(index, previous, piece)
+            self.evaluation.version = self.configuration.version
+        attack_map = self.attack_map
+        if attack_map is not None and attack_map.version == version:
+            attack_map.update(index, piece)
+            attack_map.version = self.configuration.version
+
+    def _play(self, from_square, to_square, promotion=None):
+        piece = self.configuration.get(from_square)
+        captured = self.configuration.get(to_square)
+        captured_square = to_square
+        undo = [
+            self.get_castling_flags(),
+            self.white_en_passant_target_file,
+            self.black_en_passant_target_file,
+            self.halfmove_clock,
+            self.fullmove_number,
+        ]
+        is_white_player = piece.isupper()
+        self.update_castling_flags(piece, from_square, to_square)
+        en_passant_square = None
+        if piece.upper() == self.PAWN:
+            en_passant_square = self.handle_pawn_move_logic(from_square, to_square)
+        # the side that just moved lost its chance to take en passant
+        if is_white_player:
+            self.white_en_passant_target_file = None
+        else:
+            self.black_en_passant_target_file = None
+        if en_passant_square is not None:
+            captured = self.configuration.get(en_passant_square)
+            captured_square = en_passant_square
+            self._set_square(en_passant_square, None)
+        rook_from, rook_to = self.get_castling_rook_move(piece, from_square, to_square)
+        if rook_from is not None:
+            self._set_square(rook_to, self.configuration.get(rook_from))
+            self._set_square(rook_from, None)
+        self._set_square(from_square, None)
+        self._set_square(to_square, self.get_promoted_piece(piece, to_square, promotion))
+        if piece.upper() == self.PAWN or captured is not None:
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if not is_white_player:
+            self.fullmove_number += 1
+        return (from_square, to_square, piece, captured, captured_square, rook_from, rook_to, *undo)
+
+    def update_castling_flags(self, piece, from_square, to_square):
         if piece == self.KING:
-            if self.get_player_from_square(from_square) == self.LIGHT_PLAYER:
-                self.has_white_king_moved = True
-            else:
-                self.has_black_king_moved = True
-        if piece == self.ROOK:
-            if self.get_player_from_square(from_square) == self.LIGHT_PLAYER:
-                if from_square == "h1":
-                    self.has_white_short_castle_rook_moved = True
-                if from_square == "a1":
-                    self.has_white_long_castle_rook_moved = True
-            else:
-                if from_square == "h8":
-                    self.has_black_short_castle_rook_moved = True
-                if from_square == "a8":
-                    self.has_black_long_castle_rook_moved = True
-        if piece == self.PAWN:
-            self.handle_pawn_move_logic(from_square, to_square)
-        self.configuration[to_square] = self.configuration.get(from_square)
-        self.configuration[from_square] = None
-        # self.draw_simple()
-    
+            self.has_white_king_moved = True
+        if piece == self.KING.lower():
+            self.has_black_king_moved = True
+        # a rook leaving or being taken on its corner can no longer castle
+        for square in (from_square, to_square):
+            if square == "h1":
+                self.has_white_short_castle_rook_moved = True
+            if square == "a1":
+                self.has_white_long_castle_rook_moved = True
+            if square == "h8":
+                self.has_black_short_castle_rook_moved = True
+            if square == "a8":
+                self.has_black_long_castle_rook_moved = True
+
+    def get_castling_rook_move(self, piece, from_square, to_square):
+        if piece.upper() != self.KING or from_square[0] != "e" or abs(self.convert(to_square[0]) - self.convert(from_square[0])) != 2:
+            return None, None
+        row = from_square[1]
+        if to_square[0] == "g":
+            rook_from, rook_to = "h" + row, "f" + row
+        else:
+            rook_from, rook_to = "a" + row, "d" + row
+        if self.configuration.get(rook_from) is None:
+            return None, None
+        return rook_from, rook_to
+
+    def get_promoted_piece(self, piece, to_square, promotion=None):
+        if piece.upper() != self.PAWN or to_square[1] not in "18":
+            return piece
+        if promotion is None:
+            promotion = self.QUEEN
+        return promotion.upper() if piece.isupper() else promotion.lower()
+
     def handle_pawn_move_logic(self, from_square, to_square):
         file, row = self.from_square(to_square)
+        from_file, from_row = self.from_square(from_square)
         # flag for letting the other player use en passant move
         is_white_player = self.is_white_player(from_square)
-        if is_white_player and row == 4: # row is indexed from 0, row 3 means 8-3-1 = 4th row (A4-H4)
+        if is_white_player and row == 4 and from_row == 6: # row is indexed from 0, row 4 means 8-4 = 4th row (A4-H4)
             self.black_en_passant_target_file = file
-        if not is_white_player and row == 3: # row is indexed from 0, row 4 means 8-4-1 = 3rd row (A3-H3)
+        if not is_white_player and row == 3 and from_row == 1: # row is indexed from 0, row 3 means 8-3 = 5th row (A5-H5)
             self.white_en_passant_target_file = file
-        
-        # print(f"white_en_passant_target_file is {self.white_en_passant_target_file}")
-        # print(f"black_en_passant_target_file is {self.black_en_passant_target_file}")
-        
-        # check if taking en passant
+
+        # check if taking en passant: a diagonal step to an empty square on the target file
+        if from_file == file or self.configuration.get(to_square) is not None:
+            return None
         if is_white_player:
-            # print(f"white going from {from_square} to {to_square} - row is {row} and file is {file}")
-            if row == 2: # row is indexed from 0, row 2 means 8-2-1 = 5th row (A5-H5)
-                if self.white_en_passant_target_file is not None:
-                    distance = self.white_en_passant_target_file - file
-                    if distance == 0:
-                        # take en passant
-                        en_passant_square = self.get_file(self.white_en_passant_target_file) + str(5)
-                        self.configuration[en_passant_square] = None
+            if row == 2 and self.white_en_passant_target_file == file: # row 2 means 8-2 = 6th row (A6-H6)
+                return self.get_file(file) + str(5)
         else:
-            # print(f"black going from {from_square} to {to_square} - row is {row} and file is {file}")
-            if row == 5: # row is indexed from 0, row 5 means 8-5-1 = 2nd row (A2-H2)
-                if self.black_en_passant_target_file is not None:
-                    distance = self.black_en_passant_target_file - file
-                    if distance == 0:
-                        # take en passant
-                        en_passant_square = self.get_file(self.black_en_passant_target_file) + str(4)
-                        self.configuration[en_passant_square] = None
-                        
-    def _is_attacking_piece(self, attacking_player, attacked_square):
-        return attacking_player != self.get_player_from_square(attacked_square)
-
-    def _get_attacking_player(self, king_square):
-        return self.DARK_PLAYER if self.get_position_player(king_square) == self.LIGHT_PLAYER else self.LIGHT_PLAYER
+            if row == 5 and self.black_en_passant_target_file == file: # row 5 means 8-5 = 3rd row (A3-H3)
+                return self.get_file(file) + str(4)
+        return None
 
     def is_in_check(self, king_square:str):
-        attacking_player = self._get_attacking_player(king_square)
-        attacking_squares = []
-        for square in self.configuration.keys():
-            if self.configuration.get(square) is not None:
-                if self._is_attacking_piece(attacking_player, square):
-                    attacking_squares.append(square)
-        attacked_squares = []
-        for attacking_square in attacking_squares:
-            attacked_squares.extend(self.get_legal_moves(self.get_piece(attacking_square), attacking_square))
-        return king_square in attacked_squares
+        king_player = self.get_player_from_square(king_square)
+        return self.is_attacked(king_square, self.get_other_player(king_player))
     
     def is_checkmate(self, king_square:str):
         king = self.get_piece(king_square)
@@ -578,16 +727,19 @@ class ChessBoard(board.Board):
     def switch_player(self):
         self.current_player = self.LIGHT_PLAYER if self.current_player == self.DARK_PLAYER else self.DARK_PLAYER
     
+    def get_king_square(self, player):
+        king = self.KING if player == self.LIGHT_PLAYER else self.KING.lower()
+        for square, piece in self.configuration.items():
+            if piece == king:
+                return square
+        return None
+
+    def is_player_in_check(self, player):
+        king_square = self.get_king_square(player)
+        return king_square is not None and self.is_attacked(king_square, self.get_other_player(player))
+
     def is_stalemated(self, player):
-        for square in self.configuration.keys():
-            piece = self.configuration.get(square)
-            if piece is not None and piece.lower() == "k":
-                if player == self.LIGHT_PLAYER and piece.isupper():
-                    king_square = square
-                if player == self.DARK_PLAYER and piece.islower():
-                    king_square = square
-        king = self.get_piece(king_square)
-        return not self.can_player_move_any_piece_except_king(player) and not self.is_in_check(king_square) and len(self.get_legal_moves(king, king_square)) == 0
+        return not self.has_legal_move(player) and not self.is_player_in_check(player)
     
     def get_player_pieces(self, player) -> dict:
         player_pieces = {}
@@ -600,10 +752,10 @@ class ChessBoard(board.Board):
         return player_pieces
     
     def can_player_move_any_piece_except_king(self, player):
-        pieces = self.get_player_pieces(player)
-        for square, piece in pieces.items():
-            if piece.lower() != "k" and len(self.get_legal_moves(piece, square)) > 0:
-                return True
+        position = self.get_bitboard_position()
+        kings = position.pieces(bitboard.KING, self.get_player_index(player))
+        for _ in self.generate_legal_targets(player, bitboard.FULL ^ kings):
+            return True
         return False
     
     def is_next_file(self, file, target_file):
@@ -0,0 +1,168 @@
+import argparse
+import collections
+import concurrent.futures
+import os
+import sys
+import time
+import chessboard
+
+'''
+Label positions read from a FEN file as normal, check, checkmate or stalemate
+
+Chunks of FENs are classified by a process pool, every worker reusing one board.
+At most a few chunks per worker are in flight, and results are written in input order.
+
+Usage: python classify.py INPUT [--output OUTPUT] [--workers N] [--chunk-size N]
+'''
+
+NORMAL = "normal"
+CHECK = "check"
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+INVALID = "invalid"
+
+DEFAULT_CHUNK_SIZE = 1000
+# chunks in flight per worker before the reader waits for the oldest one
+PENDING_CHUNKS_PER_WORKER = 2
+
+_worker_board = None
+
+
+class WorkerStats():
+    def __init__(self, pid):
+        self.pid = pid
+        self.chunks = 0
+        self.positions = 0
+        self.seconds = 0.0
+
+    def get_positions_per_second(self):
+        if self.seconds == 0:
+            return 0
+        return int(self.positions / self.seconds)
+
+    def __str__(self) -> str:
+        return f"worker {self.pid}: {self.chunks} chunks {self.positions} positions {self.seconds:.3f}s busy {self.get_positions_per_second()} positions/s"
+
+
+class ClassifyStats():
+    def __init__(self):
+        self.positions = 0
+        self.seconds = 0.0
+        self.labels = collections.Counter()
+        self.workers = {}
+
+    def add_chunk(self, labels, pid, seconds):
+        self.positions += len(labels)
+        self.labels.update(labels)
+        worker = self.workers.setdefault(pid, WorkerStats(pid))
+        worker.chunks += 1
+        worker.positions += len(labels)
+        worker.seconds += seconds
+
+    def get_positions_per_second(self):
+        if self.seconds == 0:
+            return 0
+        return int(self.positions / self.seconds)
+
+    def __str__(self) -> str:
+        labels = " ".join(f"{label}={count}" for label, count in sorted(self.labels.items()))
+        return f"Positions: {self.positions} Time: {self.seconds:.3f}s Positions/s: {self.get_positions_per_second()} {labels}"
+
+
+def classify_board(board) -> str:
+    player = board.current_player
+    in_check = board.is_player_in_check(player)
+    if board.has_legal_move(player):
+        return CHECK if in_check else NORMAL
+    return CHECKMATE if in_check else STALEMATE
+
+
+def classify_fen(board, fen) -> str:
+    try:
+        board.set_fen(fen)
+        return classify_board(board)
+    except Exception:
+        return INVALID
+
+
+def _init_worker(backend):
+    global _worker_board
+    _worker_board = chessboard.ChessBoard(0, backend=backend)
+
+
+def _classify_chunk(fens):
+    start = time.perf_counter()
+    labels = [classify_fen(_worker_board, fen) for fen in fens]
+    return labels, os.getpid(), time.perf_counter() - start
+
+
+def _read_chunks(fens, chunk_size):
+    chunk = []
+    for fen in fens:
+        fen = fen.strip()
+        if not fen:
+            continue
+        chunk.append(fen)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def classify(fens, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, backend=chessboard.ChessBoard.BITBOARD_BACKEND, stats=None):
+    '''
+    Yields (fen, label) for every non empty line of fens, in input order.
+
+    fens is read lazily: only workers * PENDING_CHUNKS_PER_WORKER chunks are queued at a time.
+    '''
+    if stats is None:
+        stats = ClassifyStats()
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(backend,)) as executor:
+        for chunk in _read_chunks(fens, chunk_size):
+            if len(pending) >= workers * PENDING_CHUNKS_PER_WORKER:
+                yield from _collect(pending.popleft(), stats)
+            pending.append((chunk, executor.submit(_classify_chunk, chunk)))
+        while pending:
+            yield from _collect(pending.popleft(), stats)
+    stats.seconds = time.perf_counter() - start
+
+
+def _collect(pending_chunk, stats):
+    chunk, future = pending_chunk
+    labels, pid, seconds = future.result()
+    stats.add_chunk(labels, pid, seconds)
+    return zip(chunk, labels)
+
+
+def classify_file(input_path, output_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, backend=chessboard.ChessBoard.BITBOARD_BACKEND) -> ClassifyStats:
+    # writes one "fen<TAB>label" line per position
+    stats = ClassifyStats()
+    with open(input_path) as fens, open(output_path, "w") as output:
+        for fen, label in classify(fens, workers, chunk_size, backend, stats):
+            output.write(f"{fen}\t{label}\n")
+    return stats
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Label the positions of a FEN file as normal, check, checkmate or stalemate")
+    parser.add_argument("input", help="file with one FEN per line")
+    parser.add_argument("--output", help="defaults to INPUT with a .labels extension")
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of CPUs")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--backend", choices=chessboard.ChessBoard.BACKENDS, default=chessboard.ChessBoard.BITBOARD_BACKEND)
+    arguments = parser.parse_args(arguments)
+
+    output = arguments.output or os.path.splitext(arguments.input)[0] + ".labels"
+    stats = classify_file(arguments.input, output, arguments.workers, arguments.chunk_size, arguments.backend)
+    for worker in sorted(stats.workers.values(), key=lambda worker: worker.pid):
+        print(worker)
+    print(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
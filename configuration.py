@@ -0,0 +1,25 @@
+class Configuration(dict):
+    # square -> piece mapping that counts its changes so derived state knows when to rebuild
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, square, piece):
+        dict.__setitem__(self, square, piece)
+        self.version += 1
+
+    def __delitem__(self, square):
+        dict.__delitem__(self, square)
+        self.version += 1
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return dict.pop(self, *args)
+
+    def clear(self):
+        dict.clear(self)
+        self.version += 1
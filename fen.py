@@ -0,0 +1,81 @@
+import bitboard
+
+'''
+Forsyth-Edwards Notation: piece placement, side to move, castling, en passant and clocks
+'''
+
+# squares in the order a FEN lists them: a8 to h8, then down to a1 to h1
+FEN_SQUARES = [file + rank for rank in "87654321" for file in "abcdefgh"]
+EMPTY_RUNS = {str(count): count for count in range(1, 9)}
+RUN_DIGITS = [""] + [str(count) for count in range(1, 9)]
+PIECES = frozenset(bitboard.PIECE_CHARACTERS)
+# white short, white long, black short, black long, as in ChessBoard.get_castling_rights
+CASTLING_CHARACTERS = "KQkq"
+# fields used when a FEN stops after the piece placement
+DEFAULT_FIELDS = ["w", "KQkq", "-", "0", "1"]
+
+
+def parse_placement(placement) -> dict:
+    configuration = {}
+    index = 0
+    for rank in placement.split("/"):
+        end = index + 8
+        for character in rank:
+            if character in PIECES:
+                if index >= end:
+                    raise Exception(f"Unexpected fen content: {character} in {rank}")
+                configuration[FEN_SQUARES[index]] = character
+                index += 1
+            elif character in EMPTY_RUNS:
+                index += EMPTY_RUNS[character]
+            else:
+                raise Exception(f"Unexpected fen content: {character} in {rank}")
+        if index > end:
+            raise Exception(f"Unexpected fen content: too many squares in {rank}")
+        index = end
+    return configuration
+
+
+def format_placement(configuration) -> str:
+    get = configuration.get
+    ranks = []
+    for start in range(0, 64, 8):
+        rank = ""
+        empty = 0
+        for square in FEN_SQUARES[start:start + 8]:
+            piece = get(square)
+            if piece is None:
+                empty += 1
+            else:
+                rank += RUN_DIGITS[empty] + piece
+                empty = 0
+        ranks.append(rank + RUN_DIGITS[empty])
+    return "/".join(ranks)
+
+
+def parse(fen):
+    '''
+    Returns (placement, is_white_to_move, castling rights, en passant square, halfmove clock, fullmove number).
+
+    Castling rights are four booleans ordered like CASTLING_CHARACTERS, missing fields take DEFAULT_FIELDS.
+    '''
+    fields = fen.split()
+    if not fields:
+        raise Exception(f"Empty fen: {fen}")
+    placement = parse_placement(fields[0])
+    side, castling, en_passant, halfmove_clock, fullmove_number = fields[1:6] + DEFAULT_FIELDS[len(fields) - 1:]
+    if side not in ("w", "b"):
+        raise Exception(f"Invalid fen side to move: {side}")
+    if castling != "-" and not set(castling) <= set(CASTLING_CHARACTERS):
+        raise Exception(f"Invalid fen castling rights: {castling}")
+    if en_passant != "-" and en_passant not in bitboard.SQUARE_INDEX:
+        raise Exception(f"Invalid fen en passant square: {en_passant}")
+    if not halfmove_clock.isdigit() or not fullmove_number.isdigit():
+        raise Exception(f"Invalid fen clocks: {halfmove_clock} {fullmove_number}")
+    castling_rights = tuple(character in castling for character in CASTLING_CHARACTERS)
+    return placement, side == "w", castling_rights, None if en_passant == "-" else en_passant, int(halfmove_clock), int(fullmove_number)
+
+
+def format_fields(is_white_to_move, castling_rights, en_passant, halfmove_clock, fullmove_number) -> str:
+    castling = "".join(character for character, castling_right in zip(CASTLING_CHARACTERS, castling_rights) if castling_right)
+    return f"{'w' if is_white_to_move else 'b'} {castling or '-'} {en_passant or '-'} {halfmove_clock} {fullmove_number}"
@@ -0,0 +1,138 @@
+import argparse
+import multiprocessing
+import multiprocessing.shared_memory
+import sys
+import time
+import chessboard
+import perft
+import search
+import transposition
+
+'''
+Lazy SMP: several processes search the same root and share one transposition table
+
+The table lives in shared memory without locks; every entry is stored as (key ^ data, data)
+so an entry torn by two concurrent writers fails the key check and reads as a miss.
+Helpers start one ply deeper on odd workers and try the root moves in a rotated order,
+so they fill the table with entries the main worker has not searched yet.
+
+Usage: python lazy_smp.py [--fen FEN] [--workers N] [--time SECONDS] [--depth N] [--hash MB]
+'''
+
+DEFAULT_WORKERS = 4
+# helpers look at the stop event every TIME_CHECK_INTERVAL nodes
+TIME_CHECK_INTERVAL = search.TIME_CHECK_INTERVAL
+
+
+class HelperSearcher(search.Searcher):
+    def __init__(self, board, worker, stop_event, max_time=None, max_depth=64, max_nodes=None, transposition_table=None):
+        search.Searcher.__init__(self, board, max_time, max_depth, max_nodes, transposition_table)
+        self.worker = worker
+        self.stop_event = stop_event
+        self.start_depth = 1 + worker % 2
+
+    def order_root_moves(self, root_moves):
+        root_moves = search.Searcher.order_root_moves(self, root_moves)
+        if not root_moves:
+            return root_moves
+        offset = self.worker % len(root_moves)
+        return root_moves[offset:] + root_moves[:offset]
+
+    def check_limits(self):
+        search.Searcher.check_limits(self)
+        if self.nodes % TIME_CHECK_INTERVAL == 0 and self.stop_event.is_set():
+            raise search.SearchTimeout()
+
+
+class ParallelSearchResult(search.SearchResult):
+    def __init__(self, result, worker_results, seconds):
+        search.SearchResult.__init__(self, result.best_move, result.score, result.depth, result.principal_variation, sum(worker.nodes for worker in worker_results), seconds)
+        self.worker_results = worker_results
+
+    def __str__(self) -> str:
+        return f"{search.SearchResult.__str__(self)} workers {len(self.worker_results)}"
+
+
+def _search_worker(worker, fen, backend, shared_memory_name, table_mb, max_time, max_depth, max_nodes, stop_event, results):
+    shared_memory = multiprocessing.shared_memory.SharedMemory(name=shared_memory_name)
+    table = transposition.TranspositionTable(table_mb, shared_memory.buf)
+    try:
+        board = chessboard.ChessBoard(0, fen, backend)
+        result = HelperSearcher(board, worker, stop_event, max_time, max_depth, max_nodes, table).search()
+        if worker == 0:
+            # the main worker decides when the search is over
+            stop_event.set()
+        results.put((worker, result.best_move, result.score, result.depth, result.principal_variation, result.nodes, result.seconds))
+    finally:
+        table.close()
+        shared_memory.close()
+
+
+def select_result(worker_results):
+    # the deepest completed iteration wins, the main worker breaks ties
+    return max(worker_results, key=lambda result: (result.depth, -result.worker))
+
+
+def search_fen(fen, workers=DEFAULT_WORKERS, max_time=None, max_depth=64, max_nodes=None, table_mb=search.TRANSPOSITION_TABLE_MB, backend=chessboard.ChessBoard.BITBOARD_BACKEND) -> ParallelSearchResult:
+    '''
+    Searches the position with workers processes sharing one transposition table.
+
+    Limits apply to every worker, the helpers stop as soon as the main worker is done.
+    '''
+    if workers < 1:
+        raise Exception(f"Worker count must be positive: {workers}")
+    start = time.perf_counter()
+    context = multiprocessing.get_context()
+    shared_memory = multiprocessing.shared_memory.SharedMemory(create=True, size=transposition.get_table_bytes(table_mb))
+    try:
+        stop_event = context.Event()
+        results = context.Queue()
+        processes = [
+            context.Process(target=_search_worker, args=(worker, fen, backend, shared_memory.name, table_mb, max_time, max_depth, max_nodes, stop_event, results))
+            for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        worker_results = []
+        for _ in processes:
+            worker, best_move, score, depth, principal_variation, nodes, seconds = results.get()
+            result = search.SearchResult(best_move, score, depth, principal_variation, nodes, seconds)
+            result.worker = worker
+            worker_results.append(result)
+            if worker == 0:
+                stop_event.set()
+        for process in processes:
+            process.join()
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+    worker_results.sort(key=lambda result: result.worker)
+    return ParallelSearchResult(select_result(worker_results), worker_results, time.perf_counter() - start)
+
+
+def search(board, workers=DEFAULT_WORKERS, max_time=None, max_depth=64, max_nodes=None, table_mb=search.TRANSPOSITION_TABLE_MB) -> ParallelSearchResult:
+    # the workers rebuild the board from its FEN, which carries the whole position
+    return search_fen(board.to_fen(), workers, max_time, max_depth, max_nodes, table_mb, board.backend)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Search a position with several processes")
+    parser.add_argument("--fen", default=perft.POSITIONS["start"][0])
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--time", type=float, default=None, help="seconds per worker")
+    parser.add_argument("--depth", type=int, default=64)
+    parser.add_argument("--hash", type=int, default=search.TRANSPOSITION_TABLE_MB, help="shared transposition table size in MB")
+    parser.add_argument("--backend", choices=chessboard.ChessBoard.BACKENDS, default=chessboard.ChessBoard.BITBOARD_BACKEND)
+    arguments = parser.parse_args(arguments)
+    if arguments.time is None and arguments.depth == 64:
+        arguments.time = 5.0
+
+    result = search_fen(arguments.fen, arguments.workers, arguments.time, arguments.depth, None, arguments.hash, arguments.backend)
+    for worker_result in result.worker_results:
+        print(f"worker {worker_result.worker}: {worker_result}")
+    print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
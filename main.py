@@ -6,6 +6,7 @@ import chessboard
 
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 800
+MOVE_CACHE_SIZE = 1024
 
 players = chessboard.ChessBoard.players
 current_player = players[0]
@@ -53,7 +54,7 @@ def highlight_king_square(window, board:chessboard.ChessBoard, square, status):
 def start_game(window):
     legal_moves = []
     run = True
-    board = chessboard.ChessBoard(WINDOW_WIDTH/8)
+    board = chessboard.ChessBoard(WINDOW_WIDTH/8, move_cache_size=MOVE_CACHE_SIZE)
     piece_selected = None
     square_selected = None
     from_square = None
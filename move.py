@@ -8,4 +8,46 @@ class Move():
         self.destination = destination
 
     def __str__(self) -> str:
-        return f"Move : {color} moves {piece} from {origin} to {destination}"
\ No newline at end of file
+        return f"Move : {color} moves {piece} from {origin} to {destination}"
+
+
+# Moves packed in 16 bits: from square (6 bits), to square (6 bits), promotion piece (2 bits), flag (2 bits)
+NORMAL = 0
+PROMOTION = 1
+EN_PASSANT = 2
+CASTLING = 3
+
+PROMOTION_PIECES = "NBRQ"
+SQUARES = [file + rank for rank in "12345678" for file in "abcdefgh"]
+
+
+def encode(from_index, to_index, promotion=None, flag=NORMAL):
+    promotion_index = PROMOTION_PIECES.index(promotion.upper()) if promotion else 0
+    return from_index | to_index << 6 | promotion_index << 12 | flag << 14
+
+
+def get_from_index(encoded_move):
+    return encoded_move & 0x3F
+
+
+def get_to_index(encoded_move):
+    return encoded_move >> 6 & 0x3F
+
+
+def get_flag(encoded_move):
+    return encoded_move >> 14
+
+
+def get_promotion(encoded_move):
+    if encoded_move >> 14 != PROMOTION:
+        return None
+    return PROMOTION_PIECES[encoded_move >> 12 & 0x3]
+
+
+def get_squares(encoded_move):
+    return SQUARES[encoded_move & 0x3F], SQUARES[encoded_move >> 6 & 0x3F], get_promotion(encoded_move)
+
+
+def get_name(encoded_move):
+    promotion = get_promotion(encoded_move)
+    return SQUARES[encoded_move & 0x3F] + SQUARES[encoded_move >> 6 & 0x3F] + (promotion.lower() if promotion else "")
@@ -0,0 +1,44 @@
+import collections
+
+
+class LegalMoveCache():
+    # bounded least recently used cache of legal move lists keyed by (position key, square)
+    def __init__(self, size):
+        if size <= 0:
+            raise Exception(f"Cache size must be positive: {size}")
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        legal_moves = self.entries.get(key)
+        if legal_moves is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return legal_moves
+
+    def put(self, key, legal_moves):
+        self.entries[key] = tuple(legal_moves)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_hit_rate(self):
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self) -> str:
+        return f"LegalMoveCache {len(self.entries)}/{self.size} hits={self.hits} misses={self.misses} evictions={self.evictions}"
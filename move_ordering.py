@@ -0,0 +1,108 @@
+import bitboard
+import chessboard
+import move
+
+PIECES = chessboard.ChessBoard.PIECES
+# PIECES goes from the king down to the pawn
+VICTIM_VALUES = {piece: len(PIECES) - index for index, piece in enumerate(PIECES)}
+ATTACKER_VALUES = {piece: index for index, piece in enumerate(PIECES)}
+
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 24
+FIRST_KILLER_SCORE = 1 << 23
+SECOND_KILLER_SCORE = FIRST_KILLER_SCORE - 1
+# history scores stay below the killers
+HISTORY_LIMIT = 1 << 22
+KILLER_SLOTS = 2
+MAX_PLY = 128
+
+
+def get_capture_score(attacker, victim):
+    # most valuable victim first, then least valuable attacker
+    return CAPTURE_SCORE + VICTIM_VALUES[victim] * 8 + ATTACKER_VALUES[attacker]
+
+
+def pick_next(moves, scores, start):
+    # partial selection sort: only the next best move is brought forward
+    best = start
+    best_score = scores[start]
+    for index in range(start + 1, len(moves)):
+        if scores[index] > best_score:
+            best = index
+            best_score = scores[index]
+    if best != start:
+        moves[start], moves[best] = moves[best], moves[start]
+        scores[start], scores[best] = scores[best], scores[start]
+    return moves[start]
+
+
+class MoveOrderer():
+    def __init__(self, max_ply=MAX_PLY):
+        self.killers = [[0] * KILLER_SLOTS for _ in range(max_ply)]
+        # indexed by the from and to squares of the packed move
+        self.history = [0] * 4096
+
+    def clear(self):
+        for killers in self.killers:
+            killers[:] = [0] * KILLER_SLOTS
+        self.history = [0] * 4096
+
+    def new_search(self):
+        for killers in self.killers:
+            killers[:] = [0] * KILLER_SLOTS
+        self.history = [score >> 1 for score in self.history]
+
+    def get_captured_piece(self, board, encoded_move):
+        if move.get_flag(encoded_move) == move.EN_PASSANT:
+            return chessboard.ChessBoard.PAWN
+        piece = board.configuration.get(bitboard.SQUARES[move.get_to_index(encoded_move)])
+        return None if piece is None else piece.upper()
+
+    def is_quiet(self, board, encoded_move):
+        return move.get_flag(encoded_move) != move.PROMOTION and self.get_captured_piece(board, encoded_move) is None
+
+    def score_moves(self, board, moves, ply, hash_move=0):
+        configuration = board.configuration
+        killers = self.killers[ply] if ply < len(self.killers) else [0] * KILLER_SLOTS
+        history = self.history
+        scores = []
+        for encoded_move in moves:
+            if encoded_move == hash_move:
+                scores.append(HASH_MOVE_SCORE)
+                continue
+            victim = self.get_captured_piece(board, encoded_move)
+            flag = move.get_flag(encoded_move)
+            if victim is not None or flag == move.PROMOTION:
+                attacker = configuration.get(bitboard.SQUARES[encoded_move & 0x3F]).upper()
+                score = get_capture_score(attacker, victim) if victim is not None else CAPTURE_SCORE
+                if flag == move.PROMOTION:
+                    score += VICTIM_VALUES[move.get_promotion(encoded_move).upper()] * 8
+                scores.append(score)
+            elif encoded_move == killers[0]:
+                scores.append(FIRST_KILLER_SCORE)
+            elif encoded_move == killers[1]:
+                scores.append(SECOND_KILLER_SCORE)
+            else:
+                scores.append(history[encoded_move & 0xFFF])
+        return scores
+
+    def add_killer(self, ply, encoded_move):
+        if ply >= len(self.killers):
+            return
+        killers = self.killers[ply]
+        if killers[0] != encoded_move:
+            killers[1] = killers[0]
+            killers[0] = encoded_move
+
+    def add_history(self, encoded_move, depth):
+        history = self.history
+        index = encoded_move & 0xFFF
+        history[index] += depth * depth
+        if history[index] >= HISTORY_LIMIT:
+            self.history = [score >> 1 for score in history]
+
+    def update(self, board, encoded_move, ply, depth):
+        # a quiet move caused a beta cutoff
+        if self.is_quiet(board, encoded_move):
+            self.add_killer(ply, encoded_move)
+            self.add_history(encoded_move, depth)
@@ -0,0 +1,193 @@
+import attack_tables
+import bitboard
+import move
+
+FULL = bitboard.FULL
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = bitboard.PAWN, bitboard.KNIGHT, bitboard.BISHOP, bitboard.ROOK, bitboard.QUEEN, bitboard.KING
+
+RANK_3 = 0x0000000000FF0000
+RANK_6 = 0x0000FF0000000000
+# squares that must be empty / must not be attacked, by color then (short, long)
+CASTLING_EMPTY_SQUARES = [(0x60, 0x0E), (0x60 << 56, 0x0E << 56)]
+CASTLING_SAFE_SQUARES = [(0x60, 0x0C), (0x60 << 56, 0x0C << 56)]
+CASTLING_ROOK_SQUARES = [(7, 0), (63, 56)]
+CASTLING_TARGETS = [(6, 2), (62, 58)]
+KING_HOME_SQUARES = [4, 60]
+# queen first so that the most useful promotion is tried first
+PROMOTION_MOVES = [move.encode(0, 0, piece, move.PROMOTION) for piece in "QRBN"]
+
+
+def _lowest_index(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+def _indexes(mask):
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def get_checkers(position, color, king_index, occupied):
+    enemy = 1 - color
+    queens = position.pieces(QUEEN, enemy)
+    checkers = attack_tables.KNIGHT_ATTACKS[king_index] & position.pieces(KNIGHT, enemy)
+    checkers |= attack_tables.PAWN_ATTACKS[color][king_index] & position.pieces(PAWN, enemy)
+    checkers |= attack_tables.rook_attacks(king_index, occupied) & (position.pieces(ROOK, enemy) | queens)
+    checkers |= attack_tables.bishop_attacks(king_index, occupied) & (position.pieces(BISHOP, enemy) | queens)
+    return checkers
+
+
+def get_pins(position, color, king_index):
+    # pinned piece index -> squares it may still move to along the pin line
+    enemy = 1 - color
+    queens = position.pieces(QUEEN, enemy)
+    snipers = attack_tables.rook_attacks(king_index, 0) & (position.pieces(ROOK, enemy) | queens)
+    snipers |= attack_tables.bishop_attacks(king_index, 0) & (position.pieces(BISHOP, enemy) | queens)
+    pins = {}
+    for sniper in _indexes(snipers):
+        between = attack_tables.BETWEEN[king_index][sniper]
+        blockers = between & position.occupied
+        if blockers and blockers & (blockers - 1) == 0 and blockers & position.occupancy[color]:
+            pins[_lowest_index(blockers)] = between | 1 << sniper
+    return pins
+
+
+def is_en_passant_legal(position, color, king_index, from_index, target_index):
+    # taking en passant removes two pawns from the same row, which can expose the king
+    captured_index = target_index - 8 if color == bitboard.WHITE else target_index + 8
+    occupied = position.occupied ^ (1 << from_index) ^ (1 << captured_index) | 1 << target_index
+    enemy = 1 - color
+    queens = position.pieces(QUEEN, enemy)
+    if attack_tables.rook_attacks(king_index, occupied) & (position.pieces(ROOK, enemy) | queens):
+        return False
+    return not attack_tables.bishop_attacks(king_index, occupied) & (position.pieces(BISHOP, enemy) | queens)
+
+
+def get_pawn_targets(position, color, index, en_passant_square):
+    empty = ~position.occupied & FULL
+    bit = 1 << index
+    if color == bitboard.WHITE:
+        single = (bit << 8) & empty
+        double = ((single & RANK_3) << 8) & empty
+    else:
+        single = (bit >> 8) & empty
+        double = ((single & RANK_6) >> 8) & empty
+    captures = attack_tables.PAWN_ATTACKS[color][index] & (position.occupancy[1 - color] | en_passant_square)
+    return single | double | captures
+
+
+def get_piece_targets(position, piece, index):
+    if piece == KNIGHT:
+        return attack_tables.KNIGHT_ATTACKS[index]
+    if piece == BISHOP:
+        return attack_tables.bishop_attacks(index, position.occupied)
+    if piece == ROOK:
+        return attack_tables.rook_attacks(index, position.occupied)
+    return attack_tables.queen_attacks(index, position.occupied)
+
+
+def get_castling_targets(position, color, castling_rights, enemy_attacks):
+    targets = 0
+    king_index = KING_HOME_SQUARES[color]
+    if not position.pieces(KING, color) & 1 << king_index:
+        return 0
+    rooks = position.pieces(ROOK, color)
+    for side in (0, 1):
+        if not castling_rights[side] or not rooks & 1 << CASTLING_ROOK_SQUARES[color][side]:
+            continue
+        if position.occupied & CASTLING_EMPTY_SQUARES[color][side] or enemy_attacks & CASTLING_SAFE_SQUARES[color][side]:
+            continue
+        targets |= 1 << CASTLING_TARGETS[color][side]
+    return targets
+
+
+def generate_legal_targets(position, color, castling_rights=(False, False), en_passant_file=None, from_mask=FULL):
+    '''
+    Yields (from index, targets mask) for every piece of color that has a legal move.
+
+    Checkers, the check evasion mask and the pins are computed once, then every
+    pseudo-legal target mask is filtered against them, without trying any move.
+    '''
+    own = position.occupancy[color]
+    kings = position.pieces(KING, color)
+    en_passant_square = 0
+    if en_passant_file is not None:
+        en_passant_square = 1 << (en_passant_file + (40 if color == bitboard.WHITE else 16))
+
+    evasion_mask = FULL
+    pins = {}
+    king_index = None
+    if kings:
+        king_index = _lowest_index(kings)
+        checkers = get_checkers(position, color, king_index, position.occupied)
+        if checkers & (checkers - 1):
+            evasion_mask = 0
+        elif checkers:
+            evasion_mask = checkers | attack_tables.BETWEEN[king_index][_lowest_index(checkers)]
+        pins = get_pins(position, color, king_index)
+
+        if kings & from_mask:
+            # the king must not stay on a ray it is moving along, so it is removed from the occupancy
+            enemy_attacks = position.attacks(1 - color, position.occupied ^ kings)
+            targets = attack_tables.KING_ATTACKS[king_index] & ~own & ~enemy_attacks
+            if not checkers:
+                targets |= get_castling_targets(position, color, castling_rights, enemy_attacks)
+            if targets:
+                yield king_index, targets
+        if not evasion_mask:
+            return
+
+    pawns = position.pieces(PAWN, color)
+    for index in _indexes(own & ~kings & from_mask):
+        bit = 1 << index
+        if pawns & bit:
+            targets = get_pawn_targets(position, color, index, en_passant_square)
+            en_passant_target = targets & en_passant_square
+            targets &= evasion_mask
+            if en_passant_target and king_index is not None:
+                captured_square = en_passant_square >> 8 if color == bitboard.WHITE else en_passant_square << 8
+                # the pawn taken en passant can be the checker itself
+                if evasion_mask & captured_square:
+                    targets |= en_passant_target
+                if not is_en_passant_legal(position, color, king_index, index, _lowest_index(en_passant_square)):
+                    targets &= ~en_passant_target
+        else:
+            piece = bitboard.PIECE_INDEX[position.mailbox[index]] % 6
+            targets = get_piece_targets(position, piece, index) & ~own & evasion_mask
+        if index in pins:
+            targets &= pins[index]
+        if targets:
+            yield index, targets
+
+
+def generate_legal_moves(position, color, castling_rights=(False, False), en_passant_file=None, from_mask=FULL):
+    '''
+    Yields every legal move of color packed as a 16 bit integer, see move.encode.
+    '''
+    pawns = position.pieces(PAWN, color)
+    kings = position.pieces(KING, color)
+    promotion_rows = 0xFF << 56 | 0xFF
+    en_passant_index = None
+    if en_passant_file is not None:
+        en_passant_index = en_passant_file + (40 if color == bitboard.WHITE else 16)
+    for from_index, targets in generate_legal_targets(position, color, castling_rights, en_passant_file, from_mask):
+        from_bit = 1 << from_index
+        if pawns & from_bit:
+            for to_index in _indexes(targets):
+                if 1 << to_index & promotion_rows:
+                    for promotion in PROMOTION_MOVES:
+                        yield from_index | to_index << 6 | promotion
+                elif to_index == en_passant_index:
+                    yield from_index | to_index << 6 | move.EN_PASSANT << 14
+                else:
+                    yield from_index | to_index << 6
+        elif kings & from_bit:
+            for to_index in _indexes(targets):
+                if abs(to_index - from_index) == 2:
+                    yield from_index | to_index << 6 | move.CASTLING << 14
+                else:
+                    yield from_index | to_index << 6
+        else:
+            for to_index in _indexes(targets):
+                yield from_index | to_index << 6
@@ -0,0 +1,129 @@
+import argparse
+import concurrent.futures
+import sys
+import time
+import chessboard
+import move
+
+'''
+Perft: count the leaf nodes of the legal move tree to a given depth
+
+Usage: python perft.py DEPTH [--position NAME | --fen FEN] [--divide] [--no-bulk] [--processes N]
+'''
+
+# Reference positions and their node counts by depth, from the Chess Programming Wiki
+POSITIONS = {
+    "start": ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", [20, 400, 8902, 197281, 4865609]),
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862, 4085603]),
+    "position3": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238, 674624]),
+    "position4": ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467, 422333]),
+    "position5": ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379, 2103487]),
+    "position6": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10", [46, 2079, 89890, 3894594]),
+}
+
+class PerftResult():
+    def __init__(self, nodes, seconds, divide=None):
+        self.nodes = nodes
+        self.seconds = seconds
+        self.divide = divide
+
+    def get_nodes_per_second(self):
+        if self.seconds == 0:
+            return 0
+        return int(self.nodes / self.seconds)
+
+    def __str__(self) -> str:
+        return f"Nodes: {self.nodes} Time: {self.seconds:.3f}s NPS: {self.get_nodes_per_second()}"
+
+
+def create_board(fen, backend=chessboard.ChessBoard.DICT_BACKEND):
+    return chessboard.ChessBoard(0, fen, backend)
+
+
+def perft(board, depth, bulk=True):
+    if depth == 0:
+        return 1
+    moves = board.generate_legal_moves()
+    # bulk counting: the number of legal moves is the number of leaves one ply down
+    if depth == 1 and bulk:
+        return len(moves)
+    nodes = 0
+    for encoded_move in moves:
+        board.make_encoded_move(encoded_move)
+        nodes += perft(board, depth - 1, bulk)
+        board.unmake_move()
+    return nodes
+
+
+def _perft_root_move(fen, backend, encoded_move, depth, bulk):
+    board = create_board(fen, backend)
+    board.make_encoded_move(encoded_move)
+    return perft(board, depth - 1, bulk)
+
+
+def divide(fen, depth, bulk=True, processes=1, backend=chessboard.ChessBoard.DICT_BACKEND):
+    board = create_board(fen, backend)
+    moves = board.generate_legal_moves()
+    if processes > 1:
+        # every worker rebuilds the root position from the fen and searches one root move
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            futures = [executor.submit(_perft_root_move, fen, backend, encoded_move, depth, bulk) for encoded_move in moves]
+            counts = [future.result() for future in futures]
+    else:
+        counts = []
+        for encoded_move in moves:
+            board.make_encoded_move(encoded_move)
+            counts.append(perft(board, depth - 1, bulk))
+            board.unmake_move()
+    return {move.get_name(encoded_move): count for encoded_move, count in zip(moves, counts)}
+
+
+def run(fen, depth, bulk=True, processes=1, backend=chessboard.ChessBoard.DICT_BACKEND):
+    start = time.perf_counter()
+    if depth == 0:
+        counts = {}
+        nodes = 1
+    else:
+        counts = divide(fen, depth, bulk, processes, backend)
+        nodes = sum(counts.values())
+    return PerftResult(nodes, time.perf_counter() - start, counts)
+
+
+def get_expected_nodes(position, depth):
+    if position not in POSITIONS:
+        return None
+    expected = POSITIONS[position][1]
+    if 0 < depth <= len(expected):
+        return expected[depth - 1]
+    return None
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Count legal move tree leaves to a given depth")
+    parser.add_argument("depth", type=int)
+    parser.add_argument("--position", choices=sorted(POSITIONS), default="start")
+    parser.add_argument("--fen", help="position to search instead of a reference position")
+    parser.add_argument("--divide", action="store_true", help="print the node count below every root move")
+    parser.add_argument("--no-bulk", action="store_true", help="make the last ply moves instead of counting them")
+    parser.add_argument("--processes", type=int, default=1, help="split the root moves across a process pool")
+    parser.add_argument("--backend", choices=chessboard.ChessBoard.BACKENDS, default=chessboard.ChessBoard.DICT_BACKEND)
+    arguments = parser.parse_args(arguments)
+
+    fen = arguments.fen if arguments.fen else POSITIONS[arguments.position][0]
+    result = run(fen, arguments.depth, not arguments.no_bulk, arguments.processes, arguments.backend)
+    if arguments.divide:
+        for move_name, count in result.divide.items():
+            print(f"{move_name}: {count}")
+    print(result)
+
+    expected = None if arguments.fen else get_expected_nodes(arguments.position, arguments.depth)
+    if expected is not None:
+        status = "ok" if expected == result.nodes else "MISMATCH"
+        print(f"Expected: {expected} ({status})")
+        if expected != result.nodes:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
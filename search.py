@@ -0,0 +1,205 @@
+import time
+import move
+import move_ordering
+import transposition
+
+MATE_SCORE = 100000
+INFINITY = 1000000
+DRAW_SCORE = 0
+# how many nodes are searched between two clock readings
+TIME_CHECK_INTERVAL = 1024
+TRANSPOSITION_TABLE_MB = 16
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult():
+    def __init__(self, best_move, score, depth, principal_variation, nodes, seconds):
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.principal_variation = principal_variation
+        self.nodes = nodes
+        self.seconds = seconds
+
+    def get_nodes_per_second(self):
+        if self.seconds == 0:
+            return 0
+        return int(self.nodes / self.seconds)
+
+    def get_best_move_squares(self):
+        if self.best_move is None:
+            return None
+        return move.get_squares(self.best_move)
+
+    def __str__(self) -> str:
+        line = " ".join(move.get_name(encoded_move) for encoded_move in self.principal_variation)
+        return f"depth {self.depth} score {self.score} nodes {self.nodes} nps {self.get_nodes_per_second()} pv {line}"
+
+
+def to_table_score(score, ply):
+    # mate scores are stored relative to the position, not to the root
+    if score >= MATE_SCORE - 1000:
+        return score + ply
+    if score <= -MATE_SCORE + 1000:
+        return score - ply
+    return score
+
+
+def from_table_score(score, ply):
+    if score >= MATE_SCORE - 1000:
+        return score - ply
+    if score <= -MATE_SCORE + 1000:
+        return score + ply
+    return score
+
+
+class Searcher():
+    def __init__(self, board, max_time=None, max_depth=64, max_nodes=None, transposition_table=None, ordering=True):
+        self.board = board
+        self.max_time = max_time
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        if transposition_table is None:
+            transposition_table = transposition.TranspositionTable(TRANSPOSITION_TABLE_MB)
+        self.transposition_table = transposition_table
+        self.ordering = ordering
+        self.move_orderer = move_ordering.MoveOrderer()
+        self.start_depth = 1
+        self.nodes = 0
+        self.deadline = None
+        self.position_keys = []
+
+    def search(self) -> SearchResult:
+        start = time.perf_counter()
+        if self.max_time is not None:
+            self.deadline = start + self.max_time
+        self.nodes = 0
+        self.position_keys = [self.board.get_zobrist_key()]
+        self.transposition_table.new_search()
+        self.move_orderer.new_search()
+        result = SearchResult(None, 0, 0, [], 0, 0)
+        root_moves = self.order_root_moves(self.board.generate_legal_moves())
+        if root_moves:
+            result.best_move = root_moves[0]
+            result.principal_variation = [root_moves[0]]
+        for depth in range(min(self.start_depth, self.max_depth), self.max_depth + 1):
+            if not root_moves:
+                break
+            try:
+                score, principal_variation = self.search_root(root_moves, depth)
+            except SearchTimeout:
+                break
+            result = SearchResult(principal_variation[0], score, depth, principal_variation, self.nodes, 0)
+            # the best move of this iteration is searched first in the next one
+            root_moves.remove(principal_variation[0])
+            root_moves.insert(0, principal_variation[0])
+            if abs(score) >= MATE_SCORE - self.max_depth:
+                break
+        result.nodes = self.nodes
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def order_root_moves(self, root_moves):
+        if not self.ordering:
+            return root_moves
+        scores = self.move_orderer.score_moves(self.board, root_moves, 0)
+        return [encoded_move for _, encoded_move in sorted(zip(scores, root_moves), key=lambda item: -item[0])]
+
+    def search_root(self, root_moves, depth):
+        alpha = -INFINITY
+        principal_variation = []
+        for encoded_move in root_moves:
+            line = []
+            self.board.make_encoded_move(encoded_move)
+            self.position_keys.append(self.board.get_zobrist_key())
+            try:
+                score = -self.negamax(depth - 1, -INFINITY, -alpha, 1, line)
+            finally:
+                self.position_keys.pop()
+                self.board.unmake_move()
+            if score > alpha:
+                alpha = score
+                principal_variation = [encoded_move] + line
+        return alpha, principal_variation
+
+    def check_limits(self):
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SearchTimeout()
+        if self.deadline is not None and self.nodes % TIME_CHECK_INTERVAL == 0 and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+
+    def is_repetition(self):
+        key = self.position_keys[-1]
+        # only positions with the same side to move and since the last irreversible move can repeat
+        distance = min(self.board.halfmove_clock, len(self.position_keys) - 1)
+        for index in range(len(self.position_keys) - 3, len(self.position_keys) - 2 - distance, -2):
+            if self.position_keys[index] == key:
+                return True
+        return False
+
+    def negamax(self, depth, alpha, beta, ply, principal_variation):
+        self.nodes += 1
+        self.check_limits()
+        if self.board.halfmove_clock >= 100 or self.is_repetition():
+            return DRAW_SCORE
+        key = self.position_keys[-1]
+        hash_move = 0
+        entry = self.transposition_table.probe(key)
+        if entry is not None:
+            hash_move, score, entry_depth, bound = entry
+            if entry_depth >= depth:
+                score = from_table_score(score, ply)
+                if bound == transposition.EXACT or (bound == transposition.LOWER_BOUND and score >= beta) or (bound == transposition.UPPER_BOUND and score <= alpha):
+                    return score
+        moves = self.board.generate_legal_moves()
+        if not moves:
+            if self.board.is_player_in_check(self.board.current_player):
+                return -MATE_SCORE + ply
+            return DRAW_SCORE
+        if depth <= 0:
+            return self.board.evaluate()
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = 0
+        scores = self.move_orderer.score_moves(self.board, moves, ply, hash_move) if self.ordering else None
+        for index in range(len(moves)):
+            encoded_move = move_ordering.pick_next(moves, scores, index) if self.ordering else moves[index]
+            line = []
+            self.board.make_encoded_move(encoded_move)
+            self.position_keys.append(self.board.get_zobrist_key())
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1, line)
+            finally:
+                self.position_keys.pop()
+                self.board.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = encoded_move
+            if score >= beta:
+                if self.ordering:
+                    self.move_orderer.update(self.board, encoded_move, ply, depth)
+                break
+            if score > alpha:
+                alpha = score
+                principal_variation[:] = [encoded_move] + line
+        if best_score >= beta:
+            bound = transposition.LOWER_BOUND
+        elif best_score > original_alpha:
+            bound = transposition.EXACT
+        else:
+            bound = transposition.UPPER_BOUND
+        self.transposition_table.store(key, best_move, to_table_score(best_score, ply), depth, bound)
+        return best_score
+
+def search(board, max_time=None, max_depth=64, max_nodes=None, transposition_table=None) -> SearchResult:
+    '''
+    Iterative deepening negamax alpha-beta search of the side to move.
+
+    Stops at max_depth, or when max_time seconds or max_nodes nodes are spent, and
+    returns the last fully searched iteration. The board is left unchanged. Pass a
+    transposition table to keep its entries from one search to the next.
+    '''
+    return Searcher(board, max_time, max_depth, max_nodes, transposition_table).search()
@@ -0,0 +1,51 @@
+import attack_map
+import bitboard
+import chessboard
+import random
+import unittest
+
+class TestAttackMap(unittest.TestCase):
+
+    def test_counts(self):
+        attacks = attack_map.AttackMap({"d1": "Q", "d4": "p", "b1": "N"})
+        assert 2 == attacks.get_attack_count(bitboard.SQUARE_INDEX["d2"], bitboard.WHITE)
+        assert 1 == attacks.get_attack_count(bitboard.SQUARE_INDEX["c3"], bitboard.BLACK)
+        assert attacks.is_attacked(bitboard.SQUARE_INDEX["d4"], bitboard.WHITE)
+        assert not attacks.is_attacked(bitboard.SQUARE_INDEX["d5"], bitboard.WHITE)
+
+    def test_update_extends_and_stops_rays(self):
+        attacks = attack_map.AttackMap({"a1": "R", "a4": "p"})
+        assert not attacks.is_attacked(bitboard.SQUARE_INDEX["a6"], bitboard.WHITE)
+        attacks.update(bitboard.SQUARE_INDEX["a4"], None)
+        assert attacks.is_attacked(bitboard.SQUARE_INDEX["a8"], bitboard.WHITE)
+        attacks.update(bitboard.SQUARE_INDEX["a2"], "P")
+        assert attacks.is_attacked(bitboard.SQUARE_INDEX["a2"], bitboard.WHITE)
+        assert not attacks.is_attacked(bitboard.SQUARE_INDEX["a3"], bitboard.WHITE)
+        assert attacks.is_attacked(bitboard.SQUARE_INDEX["b3"], bitboard.WHITE)
+
+    def test_incremental_updates_match_rebuild(self):
+        randomizer = random.Random(7)
+        for backend in chessboard.ChessBoard.BACKENDS:
+            board = chessboard.ChessBoard(100, "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", backend)
+            board.get_attack_map()
+            for _ in range(40):
+                moves = []
+                for square, piece in board.get_player_pieces(board.current_player).items():
+                    moves.extend((square, target) for target in board.get_legal_moves(piece, square))
+                if not moves:
+                    break
+                board.make_move(*randomizer.choice(moves))
+                assert board.attack_map.version == board.configuration.version
+                assert board.attack_map.counts == attack_map.AttackMap(board.configuration).counts
+            while board.undo_stack:
+                board.unmake_move()
+                assert board.attack_map.counts == attack_map.AttackMap(board.configuration).counts
+
+    def test_rebuild_after_direct_configuration_change(self):
+        board = chessboard.ChessBoard(100)
+        assert not board.is_attacked("e4")
+        board.configuration["d5"] = "p"
+        assert board.is_attacked("e4")
+
+    if __name__ == "__main__":
+        pass
@@ -0,0 +1,35 @@
+import attack_tables
+import unittest
+
+class TestAttackTables(unittest.TestCase):
+
+    def test_knight_squares(self):
+        assert ["d2", "a3", "c3"] == attack_tables.KNIGHT_SQUARES["b1"]
+        assert 8 == len(attack_tables.KNIGHT_SQUARES["e4"])
+
+    def test_king_squares(self):
+        assert ["b1", "a2", "b2"] == attack_tables.KING_SQUARES["a1"]
+        assert 8 == len(attack_tables.KING_SQUARES["d5"])
+
+    def test_pawn_attack_squares(self):
+        white, black = attack_tables.PAWN_ATTACK_SQUARES
+        assert ["d3", "f3"] == white["e2"]
+        assert ["g6"] == black["h7"]
+
+    def test_ray_squares(self):
+        assert ["d2", "e3", "f4", "g5", "h6"] == attack_tables.RAY_SQUARES[(1, 1)]["c1"]
+        assert ["a3", "a2", "a1"] == attack_tables.RAY_SQUARES[(0, -1)]["a4"]
+        assert [] == attack_tables.RAY_SQUARES[(-1, 0)]["a4"]
+
+    def test_rook_attacks_stop_on_blockers(self):
+        occupied = 1 << attack_tables.SQUARE_INDEX["a4"] | 1 << attack_tables.SQUARE_INDEX["c1"]
+        attacks = attack_tables.rook_attacks(attack_tables.SQUARE_INDEX["a1"], occupied)
+        assert ["b1", "c1", "a2", "a3", "a4"] == attack_tables.bitboard.squares(attacks)
+
+    def test_between(self):
+        between = attack_tables.BETWEEN[attack_tables.SQUARE_INDEX["e1"]][attack_tables.SQUARE_INDEX["h4"]]
+        assert ["f2", "g3"] == attack_tables.bitboard.squares(between)
+        assert 0 == attack_tables.BETWEEN[attack_tables.SQUARE_INDEX["e1"]][attack_tables.SQUARE_INDEX["f3"]]
+
+    if __name__ == "__main__":
+        pass
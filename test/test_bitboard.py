@@ -0,0 +1,60 @@
+import bitboard
+import unittest
+
+class TestBitboard(unittest.TestCase):
+
+    def test_square_index(self):
+        assert 0 == bitboard.SQUARE_INDEX["a1"]
+        assert 7 == bitboard.SQUARE_INDEX["h1"]
+        assert 28 == bitboard.SQUARE_INDEX["e4"]
+        assert 63 == bitboard.SQUARE_INDEX["h8"]
+
+    def test_set_and_get_piece(self):
+        position = bitboard.BitboardPosition({"e1": "K", "e8": "k", "d4": None})
+        assert "K" == position.get("e1")
+        assert "k" == position["e8"]
+        assert None == position.get("d4")
+        assert None == position.get("`4")
+        assert 2 == len(position)
+        position["e1"] = None
+        assert None == position.get("e1")
+        assert 0 == position.occupancy[bitboard.WHITE]
+        assert 1 << bitboard.SQUARE_INDEX["e8"] == position.occupied
+
+    def test_replace_piece(self):
+        position = bitboard.BitboardPosition({"d4": "P"})
+        position["d4"] = "q"
+        assert 0 == position.pieces(bitboard.PAWN, bitboard.WHITE)
+        assert 1 << bitboard.SQUARE_INDEX["d4"] == position.pieces(bitboard.QUEEN, bitboard.BLACK)
+        assert 0 == position.occupancy[bitboard.WHITE]
+
+    def test_items(self):
+        position = bitboard.BitboardPosition({"h8": "r", "a1": "R"})
+        assert [("a1", "R"), ("h8", "r")] == position.items()
+        assert ["a1", "h8"] == list(position)
+
+    def test_knight_attacks(self):
+        attacks = bitboard.knight_attacks(1 << bitboard.SQUARE_INDEX["a1"])
+        assert ["c2", "b3"] == bitboard.squares(attacks)
+        attacks = bitboard.knight_attacks(1 << bitboard.SQUARE_INDEX["d4"])
+        assert 8 == len(bitboard.squares(attacks))
+
+    def test_king_attacks(self):
+        attacks = bitboard.king_attacks(1 << bitboard.SQUARE_INDEX["h8"])
+        assert ["g7", "h7", "g8"] == bitboard.squares(attacks)
+
+    def test_pawn_attacks(self):
+        pawns = 1 << bitboard.SQUARE_INDEX["a2"] | 1 << bitboard.SQUARE_INDEX["h7"]
+        assert ["b3", "g8"] == bitboard.squares(bitboard.pawn_attacks(pawns, bitboard.WHITE))
+        assert ["b1", "g6"] == bitboard.squares(bitboard.pawn_attacks(pawns, bitboard.BLACK))
+
+    def test_sliding_attacks_stop_on_blockers(self):
+        position = bitboard.BitboardPosition({"a1": "R", "a4": "p", "c1": "N"})
+        attacks = position.attacks(bitboard.WHITE)
+        assert "a4" in bitboard.squares(attacks)
+        assert "a5" not in bitboard.squares(attacks)
+        assert "c1" in bitboard.squares(attacks)
+        assert "d1" not in bitboard.squares(attacks)
+
+    if __name__ == "__main__":
+        pass
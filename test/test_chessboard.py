@@ -1,6 +1,7 @@
 import chessboard
 import unittest
 import colors
+import move
 
 class TestChessboard(unittest.TestCase):
 
@@ -504,6 +505,183 @@ class TestChessboard(unittest.TestCase):
         assert self.board.moves[1].origin == "e7"
         assert self.board.moves[1].destination == "e5"
 
+    def test_unknown_backend(self):
+        try:
+            chessboard.ChessBoard(100, backend="array")
+            assert False
+        except Exception as e:
+            assert "Unknown backend: array" == f"{e}"
+
+    def test_bitboard_backend_to_fen(self):
+        self.board = chessboard.ChessBoard(100, backend=chessboard.ChessBoard.BITBOARD_BACKEND)
+        assert self.board.to_fen() == "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+        self.board.move("e2", "e4")
+        assert self.board.to_fen() == "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 1"
+
+    def test_bitboard_backend_legal_moves(self):
+        fens = [
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+            "K7/1r6/2q5/8/8/8/P7/8 w KQkq - 0 1",
+        ]
+        for fen in fens:
+            dict_board = chessboard.ChessBoard(100, fen)
+            bitboard_board = chessboard.ChessBoard(100, fen, chessboard.ChessBoard.BITBOARD_BACKEND)
+            for square, piece in dict_board.get_player_pieces(dict_board.LIGHT_PLAYER).items():
+                assert sorted(dict_board.get_legal_moves(piece, square)) == sorted(bitboard_board.get_legal_moves(piece, square))
+
+    def test_get_attacked_squares(self):
+        for backend in chessboard.ChessBoard.BACKENDS:
+            self.board = chessboard.ChessBoard(100, backend=backend)
+            attacked_squares = self.board.get_attacked_squares(self.board.DARK_PLAYER)
+            for file in "abcdefgh":
+                assert f"{file}6" in attacked_squares
+                assert f"{file}5" not in attacked_squares
+            assert "a8" not in attacked_squares
+            assert "b8" in attacked_squares
+
+    def test_make_and_unmake_move(self):
+        fen = self.board.to_fen()
+        self.board.make_move("e2", "e4")
+        assert self.board.get_piece("e4") == "P"
+        assert self.board.current_player == self.board.DARK_PLAYER
+        assert self.board.black_en_passant_target_file == 4
+        assert len(self.board.moves) == 0
+        self.board.unmake_move()
+        assert self.board.to_fen() == fen
+        assert self.board.current_player == self.board.LIGHT_PLAYER
+        assert self.board.black_en_passant_target_file is None
+        assert len(self.board.undo_stack) == 0
+
+    def test_unmake_capture_restores_piece_and_clocks(self):
+        self.board = chessboard.ChessBoard(100, "4k3/8/8/2p5/4N3/8/8/4K3 w KQkq - 0 1")
+        self.board.halfmove_clock = 7
+        self.board.make_move("e4", "c5")
+        self.board.make_move("e8", "d7")
+        assert self.board.halfmove_clock == 1
+        assert self.board.fullmove_number == 2
+        self.board.unmake_move()
+        self.board.unmake_move()
+        assert self.board.get_piece("e4") == "N"
+        assert self.board.get_piece("c5") == "p"
+        assert self.board.halfmove_clock == 7
+        assert self.board.fullmove_number == 1
+
+    def test_make_and_unmake_castling(self):
+        self.board = chessboard.ChessBoard(100, "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        self.board.make_move("e1", "g1")
+        assert self.board.get_piece("f1") == "R"
+        assert self.board.get_piece("h1") is None
+        assert self.board.has_white_king_moved
+        self.board.make_move("e8", "c8")
+        assert self.board.get_piece("d8") == "r"
+        self.board.unmake_move()
+        self.board.unmake_move()
+        assert self.board.get_piece("h1") == "R"
+        assert self.board.get_piece("f1") is None
+        assert self.board.get_piece("a8") == "r"
+        assert not self.board.has_white_king_moved
+        assert self.board.get_short_castle_move("e1") == ["g1"]
+
+    def test_make_and_unmake_en_passant(self):
+        self.board = chessboard.ChessBoard(100, "4k3/3p4/8/4P3/8/8/8/4K3 w KQkq - 0 1")
+        self.board.switch_player()
+        self.board.make_move("d7", "d5")
+        self.board.make_move("e5", "d6")
+        assert self.board.get_piece("d5") is None
+        self.board.unmake_move()
+        assert self.board.get_piece("d5") == "p"
+        assert self.board.get_piece("e5") == "P"
+        assert self.board.white_en_passant_target_file == 3
+
+    def test_make_and_unmake_promotion(self):
+        self.board = chessboard.ChessBoard(100, "4k3/1P6/8/8/8/8/8/4K3 w KQkq - 0 1")
+        self.board.make_move("b7", "b8", self.board.KNIGHT)
+        assert self.board.get_piece("b8") == "N"
+        self.board.unmake_move()
+        assert self.board.get_piece("b7") == "P"
+        self.board.move("b7", "b8")
+        assert self.board.get_piece("b8") == "Q"
+
+    def test_king_legal_moves_do_not_change_history(self):
+        self.board.move("e2", "e4")
+        self.board.get_king_legal_moves("e1")
+        assert len(self.board.moves) == 1
+        assert not self.board.has_white_king_moved
+        assert self.board.get_piece("e1") == "K"
+
+    def test_pinned_piece_moves_along_the_pin(self):
+        self.board = chessboard.ChessBoard(100, "4k3/8/8/8/8/2b5/3B4/4K3 w - - 0 1")
+        legal_moves = self.board.get_legal_moves(self.board.BISHOP, "d2")
+        assert sorted(legal_moves) == ["c3"]
+        self.board = chessboard.ChessBoard(100, "4r1k1/8/8/8/8/8/4N3/4K3 w - - 0 1")
+        assert self.board.get_legal_moves(self.board.KNIGHT, "e2") == []
+
+    def test_check_must_be_blocked_or_captured(self):
+        self.board = chessboard.ChessBoard(100)
+        self.board.move("d2", "d3")
+        self.board.move("f8", "b4")
+        assert sorted(self.board.get_legal_moves(self.board.KNIGHT, "b1")) == ["c3", "d2"]
+        assert sorted(self.board.get_legal_moves(self.board.PAWN, "c2")) == ["c3"]
+        assert self.board.get_legal_moves(self.board.PAWN, "h2") == []
+        assert sorted(self.board.get_legal_moves(self.board.BISHOP, "c1")) == ["d2"]
+
+    def test_double_check_only_allows_king_moves(self):
+        self.board = chessboard.ChessBoard(100, "4k3/8/8/8/1b6/5n2/8/R3K3 w - - 0 1")
+        assert self.board.get_legal_moves(self.board.ROOK, "a1") == []
+        assert sorted(self.board.get_legal_moves(self.board.KING, "e1")) == ["d1", "e2", "f1", "f2"]
+
+    def test_en_passant_cannot_expose_king(self):
+        self.board = chessboard.ChessBoard(100, "8/8/8/K2pP2r/8/8/8/7k w - - 0 1")
+        self.board.white_en_passant_target_file = 3
+        assert self.board.get_legal_moves(self.board.PAWN, "e5") == ["e6"]
+
+    def test_king_cannot_step_along_checking_ray(self):
+        self.board = chessboard.ChessBoard(100, "4k3/8/8/8/8/8/8/r3K3 w - - 0 1")
+        legal_moves = self.board.get_legal_moves(self.board.KING, "e1")
+        assert "f1" not in legal_moves
+        assert sorted(legal_moves) == ["d2", "e2", "f2"]
+
+    def test_generate_legal_moves(self):
+        moves = self.board.generate_legal_moves(self.board.LIGHT_PLAYER)
+        assert len(moves) == 20
+        assert move.encode(12, 28) in moves
+        assert sorted(move.get_name(encoded_move) for encoded_move in self.board.generate_legal_moves(self.board.DARK_PLAYER))[:2] == ["a7a5", "a7a6"]
+
+    def test_generate_legal_moves_flags(self):
+        self.board = chessboard.ChessBoard(100, "r3k2r/1P6/8/3pP3/8/8/8/R3K2R w KQkq - 0 1")
+        self.board.white_en_passant_target_file = 3
+        names = {move.get_name(encoded_move): encoded_move for encoded_move in self.board.generate_legal_moves()}
+        assert move.get_flag(names["e1g1"]) == move.CASTLING
+        assert move.get_flag(names["e1c1"]) == move.CASTLING
+        assert move.get_flag(names["e5d6"]) == move.EN_PASSANT
+        assert move.get_flag(names["e5e6"]) == move.NORMAL
+        for promotion in "qrbn":
+            assert move.get_promotion(names["b7a8" + promotion]) == promotion.upper()
+        assert "b7b8q" in names
+        self.board.make_encoded_move(names["b7a8n"])
+        assert self.board.get_piece("a8") == "N"
+
+    def test_encode_move(self):
+        encoded_move = move.encode(52, 60, "Q", move.PROMOTION)
+        assert encoded_move < 1 << 16
+        assert move.get_squares(encoded_move) == ("e7", "e8", "Q")
+        assert move.get_name(encoded_move) == "e7e8q"
+        assert move.get_promotion(move.encode(12, 28)) is None
+
+    def test_has_legal_move_is_lazy(self):
+        moves = self.board.iter_legal_moves()
+        first_move = next(moves)
+        assert first_move in self.board.generate_legal_moves()
+        assert self.board.has_legal_move()
+        self.board = chessboard.ChessBoard(100, "K7/1r6/2q5/8/8/8/8/8 w - - 0 1")
+        assert not self.board.has_legal_move()
+
+    def test_is_stalemate_for_dark_player(self):
+        self.board = chessboard.ChessBoard(100, "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        assert self.board.is_stalemated(self.board.DARK_PLAYER)
+        assert not self.board.is_stalemated(self.board.LIGHT_PLAYER)
+
     if __name__ == "__main__":
         pass
 
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import chessboard
+import classify
+import perft
+import unittest
+
+FENS = [
+    perft.POSITIONS["start"][0],
+    "3R2k1/5ppp/8/8/8/8/5PPP/6K1 b - - 0 1",
+    "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1",
+    "4k3/8/8/8/8/8/4q3/4K3 w - - 0 1",
+    "r1bqkb1r/pppp1Qpp/2n2n2/4p3/2B1P3/8/PPPP1PPP/RNB1K1NR b KQkq - 0 4",
+    "x",
+]
+LABELS = [classify.NORMAL, classify.CHECKMATE, classify.STALEMATE, classify.CHECK, classify.CHECKMATE, classify.INVALID]
+
+class TestClassify(unittest.TestCase):
+
+    def test_classify_fen(self):
+        board = chessboard.ChessBoard(0, backend="bitboard")
+        assert [classify.classify_fen(board, fen) for fen in FENS] == LABELS
+
+    def test_board_reuse_resets_state(self):
+        board = chessboard.ChessBoard(0)
+        assert classify.classify_fen(board, FENS[1]) == classify.CHECKMATE
+        assert classify.classify_fen(board, FENS[0]) == classify.NORMAL
+        assert board.current_player == board.LIGHT_PLAYER
+
+    def test_ordered_results(self):
+        fens = FENS * 7
+        stats = classify.ClassifyStats()
+        results = list(classify.classify(fens, workers=2, chunk_size=3, stats=stats))
+        assert [fen for fen, _ in results] == fens
+        assert [label for _, label in results] == LABELS * 7
+        assert stats.positions == len(fens)
+        assert sum(worker.positions for worker in stats.workers.values()) == len(fens)
+        assert sum(worker.chunks for worker in stats.workers.values()) == 14
+        assert stats.labels[classify.CHECKMATE] == 14
+
+    def test_classify_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "positions.fen")
+            output_path = os.path.join(directory, "positions.labels")
+            with open(input_path, "w") as input_file:
+                input_file.write("\n".join(FENS[:3]) + "\n\n")
+            stats = classify.classify_file(input_path, output_path, workers=1)
+            with open(output_path) as output_file:
+                assert output_file.read().splitlines() == [f"{fen}\t{label}" for fen, label in zip(FENS[:3], LABELS[:3])]
+            assert stats.positions == 3
+
+    if __name__ == "__main__":
+        pass
@@ -0,0 +1,58 @@
+import random
+import chessboard
+import evaluation
+import perft
+import unittest
+
+class TestEvaluation(unittest.TestCase):
+
+    def test_start_position_is_balanced(self):
+        board = chessboard.ChessBoard(0)
+        assert board.evaluate() == 0
+        assert board.evaluation.phase == evaluation.MAX_PHASE
+
+    def test_mirrored_positions(self):
+        white = chessboard.ChessBoard(0, "4k3/8/8/8/8/2N5/4P3/4K3 w - - 0 1")
+        black = perft.create_board("4k3/4p3/2n5/8/8/8/8/4K3 b - - 0 1")
+        assert white.evaluate() > 0
+        assert white.evaluate() == black.evaluate()
+        assert white.evaluation.get_score() == -black.evaluation.get_score()
+
+    def test_square_tables(self):
+        # a knight is better in the center than in the corner
+        center = evaluation.MIDDLEGAME_SCORES["N"][chessboard.bitboard.SQUARE_INDEX["e4"]]
+        corner = evaluation.MIDDLEGAME_SCORES["N"][chessboard.bitboard.SQUARE_INDEX["a1"]]
+        assert center > corner
+        assert evaluation.MIDDLEGAME_SCORES["n"][chessboard.bitboard.SQUARE_INDEX["e5"]] == -center
+
+    def test_phase(self):
+        board = chessboard.ChessBoard(0, "4k3/pppppppp/8/8/8/8/PPPPPPPP/R3K3 w - - 0 1")
+        board.evaluate()
+        assert board.evaluation.phase == 2
+        assert board.evaluation.get_score() == int((board.evaluation.middlegame * 2 + board.evaluation.endgame * 22) / 24)
+
+    def test_incremental_matches_rebuild(self):
+        randomizer = random.Random(13)
+        for backend in chessboard.ChessBoard.BACKENDS:
+            board = perft.create_board(perft.POSITIONS["kiwipete"][0], backend)
+            for _ in range(40):
+                moves = board.generate_legal_moves()
+                if not moves:
+                    break
+                board.make_encoded_move(randomizer.choice(moves))
+                version = board.evaluation.version
+                score = board.evaluate()
+                assert board.evaluation.version == version
+                assert score == evaluation.Evaluation(board.configuration).get_score() * (1 if board.current_player == board.LIGHT_PLAYER else -1)
+            while board.undo_stack:
+                board.unmake_move()
+            assert board.evaluation.version == board.configuration.version
+            assert board.evaluation.get_score() == evaluation.Evaluation(board.configuration).get_score()
+
+    def test_direct_configuration_edit(self):
+        board = chessboard.ChessBoard(0)
+        board.configuration["d1"] = None
+        assert board.evaluate() < -900
+
+    if __name__ == "__main__":
+        pass
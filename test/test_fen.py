@@ -0,0 +1,67 @@
+import chessboard
+import fen
+import perft
+import unittest
+
+class TestFen(unittest.TestCase):
+
+    def test_round_trip(self):
+        fens = [position for position, _ in perft.POSITIONS.values()] + [
+            "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b Kq e3 0 3",
+            "rnbqkbnr/pppp1ppp/8/3Pp3/8/8/PPP1PPPP/RNBQKBNR w - e6 0 3",
+            "8/8/8/8/8/8/8/k6K b - - 99 120",
+        ]
+        for backend in chessboard.ChessBoard.BACKENDS:
+            for position in fens:
+                assert chessboard.ChessBoard(0, position, backend).to_fen() == position
+
+    def test_state_is_loaded(self):
+        board = chessboard.ChessBoard(0, "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNBQKBNR b Kq e3 7 3")
+        assert board.current_player == board.DARK_PLAYER
+        assert board.get_castling_rights() == (True, False, False, True)
+        assert board.black_en_passant_target_file == 4
+        assert board.white_en_passant_target_file is None
+        assert board.halfmove_clock == 7
+        assert board.fullmove_number == 3
+        assert "e3" in board.get_legal_moves("p", "d4")
+
+    def test_moves_update_fen(self):
+        board = chessboard.ChessBoard(0)
+        board.make_move("e2", "e4")
+        assert board.to_fen() == "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+        board.make_move("g8", "f6")
+        board.make_move("e1", "e2")
+        assert board.to_fen() == "rnbqkb1r/pppppppp/5n2/8/4P3/8/PPPPKPPP/RNBQ1BNR b kq - 2 2"
+
+    def test_missing_fields_use_defaults(self):
+        placement, is_white_to_move, castling_rights, en_passant, halfmove_clock, fullmove_number = fen.parse("8/8/8/8/8/8/8/K6k")
+        assert placement == {"a1": "K", "h1": "k"}
+        assert is_white_to_move
+        assert castling_rights == (True, True, True, True)
+        assert en_passant is None
+        assert (halfmove_clock, fullmove_number) == (0, 1)
+        assert chessboard.ChessBoard(0, "8/8/8/8/8/8/8/K6k b").to_fen() == "8/8/8/8/8/8/8/K6k b KQkq - 0 1"
+
+    def test_format_placement(self):
+        assert fen.format_placement({"a8": "r", "h1": "K", "d4": "p"}) == "r7/8/8/8/3p4/8/8/7K"
+        assert fen.format_placement({}) == "8/8/8/8/8/8/8/8"
+
+    def test_invalid_fens(self):
+        invalid_fens = {
+            "8/8/8/8/8/8/8/8x": "Unexpected fen content: x in 8x",
+            "9/8/8/8/8/8/8/8": "Unexpected fen content: 9 in 9",
+            "ppppppppp/8/8/8/8/8/8/8": "Unexpected fen content: p in ppppppppp",
+            "8/8/8/8/8/8/8/8 x": "Invalid fen side to move: x",
+            "8/8/8/8/8/8/8/8 w KX": "Invalid fen castling rights: KX",
+            "8/8/8/8/8/8/8/8 w - e9": "Invalid fen en passant square: e9",
+            "8/8/8/8/8/8/8/8 w - - a 1": "Invalid fen clocks: a 1",
+        }
+        for invalid_fen, message in invalid_fens.items():
+            try:
+                fen.parse(invalid_fen)
+                assert False
+            except Exception as e:
+                assert message == f"{e}"
+
+    if __name__ == "__main__":
+        pass
@@ -0,0 +1,39 @@
+import lazy_smp
+import move
+import perft
+import search
+import unittest
+
+class TestLazySmp(unittest.TestCase):
+
+    def test_mate_in_one(self):
+        result = lazy_smp.search_fen("6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", workers=2, max_depth=3, table_mb=1)
+        assert move.get_name(result.best_move) == "d1d8"
+        assert result.score == search.MATE_SCORE - 1
+        assert len(result.worker_results) == 2
+        assert result.nodes == sum(worker.nodes for worker in result.worker_results)
+
+    def test_same_result_as_single_search(self):
+        fen = perft.POSITIONS["position4"][0]
+        result = lazy_smp.search_fen(fen, workers=2, max_depth=2, table_mb=1)
+        single = search.search(perft.create_board(fen, "bitboard"), max_depth=2)
+        assert result.depth == 2
+        assert result.score == single.score
+
+    def test_select_deepest_result(self):
+        results = []
+        for worker, depth in enumerate([3, 4, 4]):
+            result = search.SearchResult(worker + 1, 0, depth, [worker + 1], 10, 1)
+            result.worker = worker
+            results.append(result)
+        assert lazy_smp.select_result(results).worker == 1
+
+    def test_invalid_worker_count(self):
+        try:
+            lazy_smp.search_fen(perft.POSITIONS["start"][0], workers=0)
+            assert False
+        except Exception as e:
+            assert "Worker count must be positive: 0" == f"{e}"
+
+    if __name__ == "__main__":
+        pass
@@ -0,0 +1,51 @@
+import chessboard
+import move_cache
+import unittest
+
+class TestMoveCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = move_cache.LegalMoveCache(2)
+        cache.put(1, ["a3"])
+        cache.put(2, ["b3"])
+        assert cache.get(1) == ("a3",)
+        cache.put(3, ["c3"])
+        assert cache.get(2) is None
+        assert cache.get(3) == ("c3",)
+        assert cache.hits == 2
+        assert cache.misses == 1
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    def test_invalid_size(self):
+        try:
+            move_cache.LegalMoveCache(0)
+            assert False
+        except Exception as e:
+            assert "Cache size must be positive: 0" == f"{e}"
+
+    def test_repeated_queries_hit(self):
+        board = chessboard.ChessBoard(100, move_cache_size=64)
+        assert sorted(board.get_legal_moves("N", "g1")) == ["f3", "h3"]
+        assert sorted(board.get_legal_moves("N", "g1")) == ["f3", "h3"]
+        assert board.move_cache.hits == 1
+        assert board.move_cache.misses == 1
+
+    def test_move_and_switch_player_invalidate(self):
+        board = chessboard.ChessBoard(100, move_cache_size=64)
+        assert sorted(board.get_legal_moves("B", "f1")) == []
+        board.move("e2", "e4")
+        assert sorted(board.get_legal_moves("B", "f1")) == ["a6", "b5", "c4", "d3", "e2"]
+        board.switch_player()
+        board.get_legal_moves("B", "f1")
+        assert board.move_cache.hits == 0
+        board.configuration["d3"] = "p"
+        assert sorted(board.get_legal_moves("B", "f1")) == ["d3", "e2"]
+        assert board.move_cache.hits == 0
+
+    def test_disabled_by_default(self):
+        board = chessboard.ChessBoard(100)
+        assert board.move_cache is None
+
+    if __name__ == "__main__":
+        pass
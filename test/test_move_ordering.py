@@ -0,0 +1,60 @@
+import chessboard
+import move
+import move_ordering
+import perft
+import search
+import unittest
+
+def encode(name):
+    return move.encode(chessboard.bitboard.SQUARE_INDEX[name[:2]], chessboard.bitboard.SQUARE_INDEX[name[2:4]])
+
+class TestMoveOrdering(unittest.TestCase):
+
+    def test_mvv_lva(self):
+        assert move_ordering.get_capture_score("P", "Q") > move_ordering.get_capture_score("N", "Q")
+        assert move_ordering.get_capture_score("Q", "Q") > move_ordering.get_capture_score("P", "R")
+        assert move_ordering.get_capture_score("K", "P") > move_ordering.FIRST_KILLER_SCORE
+
+    def test_score_moves(self):
+        board = chessboard.ChessBoard(0, "4k3/8/8/3q4/2P5/8/8/3RK3 w - - 0 1")
+        orderer = move_ordering.MoveOrderer()
+        quiet = encode("e1f1")
+        orderer.add_killer(0, quiet)
+        moves = [encode("d1d2"), quiet, encode("d1d5"), encode("c4d5")]
+        scores = orderer.score_moves(board, moves, 0, hash_move=encode("d1d2"))
+        assert scores[0] == move_ordering.HASH_MOVE_SCORE
+        assert scores[1] == move_ordering.FIRST_KILLER_SCORE
+        assert scores[3] > scores[2] > scores[1]
+
+    def test_pick_next(self):
+        moves = [1, 2, 3, 4]
+        scores = [5, 40, 10, 20]
+        assert [move_ordering.pick_next(moves, scores, index) for index in range(4)] == [2, 4, 3, 1]
+
+    def test_killers_and_history(self):
+        board = chessboard.ChessBoard(0)
+        orderer = move_ordering.MoveOrderer()
+        first, second, third = encode("g1f3"), encode("b1c3"), encode("e2e4")
+        for encoded_move in (first, second, second, third):
+            orderer.update(board, encoded_move, 3, 2)
+        assert orderer.killers[3] == [third, second]
+        assert orderer.history[second & 0xFFF] == 8
+        orderer.new_search()
+        assert orderer.killers[3] == [0, 0]
+        assert orderer.history[second & 0xFFF] == 4
+
+    def test_captures_do_not_update_killers(self):
+        board = chessboard.ChessBoard(0, "4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+        orderer = move_ordering.MoveOrderer()
+        orderer.update(board, encode("d1d5"), 1, 3)
+        assert orderer.killers[1] == [0, 0]
+
+    def test_ordering_reduces_nodes(self):
+        fen = perft.POSITIONS["kiwipete"][0]
+        unordered = search.Searcher(perft.create_board(fen, "bitboard"), max_depth=3, ordering=False).search()
+        ordered = search.Searcher(perft.create_board(fen, "bitboard"), max_depth=3).search()
+        assert ordered.nodes < unordered.nodes
+        assert ordered.score == unordered.score
+
+    if __name__ == "__main__":
+        pass
@@ -0,0 +1,56 @@
+import perft
+import unittest
+
+class TestPerft(unittest.TestCase):
+
+    def test_start_position(self):
+        fen = perft.POSITIONS["start"][0]
+        for depth in range(1, 4):
+            result = perft.run(fen, depth)
+            assert result.nodes == perft.get_expected_nodes("start", depth)
+
+    def test_reference_positions(self):
+        for position, (fen, _) in perft.POSITIONS.items():
+            assert perft.run(fen, 2).nodes == perft.get_expected_nodes(position, 2)
+
+    def test_bitboard_backend(self):
+        fen = perft.POSITIONS["position4"][0]
+        assert perft.run(fen, 2, backend="bitboard").nodes == perft.get_expected_nodes("position4", 2)
+
+    def test_kiwipete_first_ply(self):
+        result = perft.run(perft.POSITIONS["kiwipete"][0], 1)
+        assert result.nodes == 48
+        assert "e1g1" in result.divide
+        assert "e1c1" in result.divide
+
+    def test_bulk_counting_gives_same_count(self):
+        board = perft.create_board(perft.POSITIONS["start"][0])
+        assert perft.perft(board, 2, bulk=True) == perft.perft(board, 2, bulk=False)
+
+    def test_divide(self):
+        counts = perft.divide(perft.POSITIONS["start"][0], 2)
+        assert len(counts) == 20
+        assert counts["e2e4"] == 20
+        assert counts["g1f3"] == 20
+
+    def test_process_pool(self):
+        fen = perft.POSITIONS["start"][0]
+        assert perft.run(fen, 2, processes=2).divide == perft.run(fen, 2).divide
+
+    def test_create_board_reads_state_fields(self):
+        board = perft.create_board("4k3/8/8/3pP3/8/8/8/4K2R w K d6 3 12")
+        assert board.current_player == board.LIGHT_PLAYER
+        assert board.white_en_passant_target_file == 3
+        assert not board.has_white_short_castle_rook_moved
+        assert board.has_white_long_castle_rook_moved
+        assert board.halfmove_clock == 3
+        assert board.fullmove_number == 12
+        board = perft.create_board("4k3/8/8/8/8/8/8/4K3 b - - 0 1")
+        assert board.current_player == board.DARK_PLAYER
+
+    def test_nodes_per_second(self):
+        result = perft.PerftResult(1000, 0.5)
+        assert result.get_nodes_per_second() == 2000
+
+    if __name__ == "__main__":
+        pass
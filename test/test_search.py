@@ -0,0 +1,67 @@
+import chessboard
+import move
+import perft
+import search
+import unittest
+
+class TestSearch(unittest.TestCase):
+
+    def test_mate_in_one(self):
+        board = chessboard.ChessBoard(0, "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1")
+        result = search.search(board, max_depth=3)
+        assert move.get_name(result.best_move) == "d1d8"
+        assert result.score == search.MATE_SCORE - 1
+        assert result.depth == 1
+
+    def test_mate_in_one_for_black(self):
+        board = perft.create_board("3r2k1/8/8/8/8/8/5PPP/6K1 b - - 0 1")
+        result = search.search(board, max_depth=3)
+        assert move.get_name(result.best_move) == "d8d1"
+
+    def test_captures_hanging_queen(self):
+        board = chessboard.ChessBoard(0, "4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1", "bitboard")
+        result = search.search(board, max_depth=2)
+        assert move.get_name(result.best_move) == "d1d5"
+        assert result.score > 0
+
+    def test_board_is_restored(self):
+        board = perft.create_board(perft.POSITIONS["kiwipete"][0])
+        fen = board.to_fen()
+        key = board.get_zobrist_key()
+        search.search(board, max_depth=2)
+        assert board.to_fen() == fen
+        assert board.get_zobrist_key() == key
+        assert len(board.undo_stack) == 0
+
+    def test_node_budget(self):
+        board = chessboard.ChessBoard(0, backend="bitboard")
+        result = search.search(board, max_depth=10, max_nodes=500)
+        assert result.nodes <= 500
+        assert 0 < result.depth < 10
+        assert result.best_move is not None
+        assert len(board.undo_stack) == 0
+
+    def test_time_budget(self):
+        board = chessboard.ChessBoard(0, backend="bitboard")
+        result = search.search(board, max_time=0.2)
+        assert result.seconds < 1
+        assert result.best_move in board.generate_legal_moves()
+
+    def test_principal_variation(self):
+        board = chessboard.ChessBoard(0, backend="bitboard")
+        result = search.search(board, max_depth=3)
+        assert result.depth == 3
+        assert result.principal_variation[0] == result.best_move
+        for encoded_move in result.principal_variation:
+            assert encoded_move in board.generate_legal_moves()
+            board.make_encoded_move(encoded_move)
+        assert result.get_nodes_per_second() > 0
+
+    def test_stalemate_has_no_move(self):
+        board = perft.create_board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        result = search.search(board, max_depth=2)
+        assert result.best_move is None
+        assert result.depth == 0
+
+    if __name__ == "__main__":
+        pass
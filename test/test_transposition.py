@@ -0,0 +1,74 @@
+import chessboard
+import search
+import transposition
+import unittest
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_store_and_probe(self):
+        table = transposition.TranspositionTable(1)
+        assert table.probe(12345) is None
+        table.store(12345, 0x1234, -250, 5, transposition.LOWER_BOUND)
+        assert table.probe(12345) == (0x1234, -250, 5, transposition.LOWER_BOUND)
+        assert table.get_hit_rate() == 0.5
+
+    def test_size(self):
+        table = transposition.TranspositionTable(1)
+        assert len(table) == 65536
+        assert len(table.table) * 8 == 1024 * 1024
+
+    def test_key_verification(self):
+        table = transposition.TranspositionTable(1)
+        table.store(7, 1, 10, 1, transposition.EXACT)
+        # same bucket, different key
+        assert table.probe(7 + table.bucket_count) is None
+        table.table[7 * 4 + 1] ^= 1 << 20
+        assert table.probe(7) is None
+
+    def test_depth_preferred_and_always_replace(self):
+        table = transposition.TranspositionTable(1)
+        deep, shallow, other = 3, 3 + table.bucket_count, 3 + 2 * table.bucket_count
+        table.store(deep, 1, 0, 8, transposition.EXACT)
+        table.store(shallow, 2, 0, 2, transposition.EXACT)
+        table.store(other, 3, 0, 1, transposition.EXACT)
+        assert table.probe(deep)[0] == 1
+        assert table.probe(shallow) is None
+        assert table.probe(other)[0] == 3
+        assert table.overwrites == 1
+        table.new_search()
+        table.store(shallow, 2, 0, 2, transposition.EXACT)
+        assert table.probe(deep) is None
+        assert table.probe(shallow)[0] == 2
+
+    def test_keeps_move_of_same_position(self):
+        table = transposition.TranspositionTable(1)
+        table.store(9, 77, 0, 2, transposition.EXACT)
+        table.store(9, 0, -30, 3, transposition.UPPER_BOUND)
+        assert table.probe(9) == (77, -30, 3, transposition.UPPER_BOUND)
+
+    def test_external_buffer(self):
+        buffer = bytearray(1024 * 1024)
+        table = transposition.TranspositionTable(1, buffer)
+        table.store(42, 5, 100, 4, transposition.EXACT)
+        assert any(buffer)
+        assert transposition.TranspositionTable(1, buffer).probe(42) == (5, 100, 4, transposition.EXACT)
+
+    def test_search_reuses_table(self):
+        board = chessboard.ChessBoard(0, "6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1", "bitboard")
+        table = transposition.TranspositionTable(1)
+        first = search.search(board, max_depth=3, transposition_table=table)
+        board = chessboard.ChessBoard(0, backend="bitboard")
+        result = search.search(board, max_depth=3, transposition_table=table)
+        assert table.hits > 0
+        assert result.depth == 3
+        assert first.score == search.MATE_SCORE - 1
+
+    def test_invalid_size(self):
+        try:
+            transposition.TranspositionTable(0)
+            assert False
+        except Exception as e:
+            assert "Table size must be positive: 0" == f"{e}"
+
+    if __name__ == "__main__":
+        pass
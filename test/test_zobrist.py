@@ -0,0 +1,62 @@
+import chessboard
+import random
+import unittest
+import zobrist
+
+class TestZobrist(unittest.TestCase):
+
+    def test_keys_are_deterministic(self):
+        board = chessboard.ChessBoard(100)
+        other_board = chessboard.ChessBoard(100, backend=chessboard.ChessBoard.BITBOARD_BACKEND)
+        assert board.get_zobrist_key() == other_board.get_zobrist_key()
+        assert board.get_zobrist_key() != 0
+
+    def test_side_to_move_changes_key(self):
+        board = chessboard.ChessBoard(100)
+        key = board.get_zobrist_key()
+        board.switch_player()
+        assert key ^ zobrist.SIDE_KEY == board.get_zobrist_key()
+
+    def test_transposition_has_same_key(self):
+        board = chessboard.ChessBoard(100)
+        board.make_move("g1", "f3")
+        board.make_move("b8", "c6")
+        board.make_move("b1", "c3")
+        other_board = chessboard.ChessBoard(100)
+        other_board.make_move("b1", "c3")
+        other_board.make_move("b8", "c6")
+        other_board.make_move("g1", "f3")
+        assert board.get_zobrist_key() == other_board.get_zobrist_key()
+
+    def test_castling_and_en_passant_change_key(self):
+        board = chessboard.ChessBoard(100, "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        key = board.get_zobrist_key()
+        board.make_move("h1", "g1")
+        board.make_move("h8", "g8")
+        board.make_move("g1", "h1")
+        board.make_move("g8", "h8")
+        assert key != board.get_zobrist_key()
+        board = chessboard.ChessBoard(100)
+        board.make_move("e2", "e4")
+        key = board.get_zobrist_key()
+        board.black_en_passant_target_file = None
+        assert key != board.get_zobrist_key()
+
+    def test_incremental_key_matches_recomputed_key(self):
+        randomizer = random.Random(3)
+        board = chessboard.ChessBoard(100)
+        keys = [board.get_zobrist_key()]
+        for _ in range(30):
+            moves = []
+            for square, piece in board.get_player_pieces(board.current_player).items():
+                moves.extend((square, target) for target in board.get_legal_moves(piece, square))
+            board.make_move(*randomizer.choice(moves))
+            assert board.piece_key == zobrist.compute_piece_key(board.configuration)
+            keys.append(board.get_zobrist_key())
+        while board.undo_stack:
+            board.unmake_move()
+            keys.pop()
+            assert keys[-1] == board.get_zobrist_key()
+
+    if __name__ == "__main__":
+        pass
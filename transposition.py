@@ -0,0 +1,122 @@
+import array
+
+EXACT = 1
+LOWER_BOUND = 2
+UPPER_BOUND = 3
+
+# every entry is two 64 bit words: (key ^ data, data), so a torn write from another process fails the key check
+ENTRY_WORDS = 2
+ENTRY_BYTES = 16
+# bucket slot 0 keeps the deepest entry of the current search, slot 1 is always replaced
+BUCKET_ENTRIES = 2
+KEY_MASK = 0xFFFFFFFFFFFFFFFF
+
+# data word layout: move (16 bits) | score + SCORE_OFFSET (32 bits) | depth (8 bits) | bound (2 bits) | age (6 bits)
+SCORE_OFFSET = 1 << 31
+AGE_MASK = 0x3F
+
+
+def pack(encoded_move, score, depth, bound, age):
+    return encoded_move | (score + SCORE_OFFSET) << 16 | depth << 48 | bound << 56 | age << 58
+
+
+def unpack(data):
+    # (move, score, depth, bound)
+    return data & 0xFFFF, (data >> 16 & 0xFFFFFFFF) - SCORE_OFFSET, data >> 48 & 0xFF, data >> 56 & 0x3
+
+
+def get_bucket_count(size_mb):
+    # a power of two so that the bucket is found by masking the key
+    buckets = max(1, size_mb * 1024 * 1024 // (ENTRY_BYTES * BUCKET_ENTRIES))
+    return 1 << (buckets.bit_length() - 1)
+
+
+def get_table_bytes(size_mb):
+    return get_bucket_count(size_mb) * BUCKET_ENTRIES * ENTRY_BYTES
+
+
+class TranspositionTable():
+    def __init__(self, size_mb=16, buffer=None):
+        if size_mb <= 0:
+            raise Exception(f"Table size must be positive: {size_mb}")
+        self.size_mb = size_mb
+        self.bucket_count = get_bucket_count(size_mb)
+        self.bucket_mask = self.bucket_count - 1
+        table_bytes = get_table_bytes(size_mb)
+        if buffer is None:
+            self.table = array.array("Q", bytes(table_bytes))
+        else:
+            # an external buffer, for instance shared memory, is used in place
+            self.table = memoryview(buffer).cast("B")[:table_bytes].cast("Q")
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        self.age = (self.age + 1) & AGE_MASK
+
+    def clear(self):
+        for index in range(len(self.table)):
+            self.table[index] = 0
+        self.age = 0
+
+    def probe(self, key):
+        '''
+        Returns (move, score, depth, bound) stored for key, or None.
+        '''
+        self.probes += 1
+        table = self.table
+        index = (key & self.bucket_mask) * BUCKET_ENTRIES * ENTRY_WORDS
+        for slot in range(index, index + BUCKET_ENTRIES * ENTRY_WORDS, ENTRY_WORDS):
+            data = table[slot + 1]
+            if data and table[slot] ^ data == key:
+                self.hits += 1
+                return unpack(data)
+        return None
+
+    def store(self, key, encoded_move, score, depth, bound):
+        table = self.table
+        index = (key & self.bucket_mask) * BUCKET_ENTRIES * ENTRY_WORDS
+        data = table[index + 1]
+        slot = index + ENTRY_WORDS
+        if not data or table[index] ^ data == key:
+            slot = index
+            if encoded_move == 0 and data:
+                # keep the best move of a shallower search of the same position
+                encoded_move = data & 0xFFFF
+        elif depth >= data >> 48 & 0xFF or data >> 58 != self.age:
+            slot = index
+        if table[slot + 1] and table[slot] ^ table[slot + 1] != key:
+            self.overwrites += 1
+        data = pack(encoded_move, score, depth, bound, self.age)
+        table[slot] = key ^ data
+        table[slot + 1] = data
+        self.stores += 1
+
+    def close(self):
+        # an external buffer cannot be released while the table still views it
+        if isinstance(self.table, memoryview):
+            self.table.release()
+
+    def get_hit_rate(self):
+        if self.probes == 0:
+            return 0.0
+        return self.hits / self.probes
+
+    def get_usage(self, sample=1000):
+        # permille of the sampled entries written during the current search
+        entries = min(sample, len(self.table) // ENTRY_WORDS)
+        used = 0
+        for slot in range(0, entries * ENTRY_WORDS, ENTRY_WORDS):
+            data = self.table[slot + 1]
+            if data and data >> 58 == self.age:
+                used += 1
+        return used * 1000 // entries
+
+    def __len__(self):
+        return self.bucket_count * BUCKET_ENTRIES
+
+    def __str__(self) -> str:
+        return f"TranspositionTable {self.size_mb}MB entries={len(self)} probes={self.probes} hits={self.hits} stores={self.stores} overwrites={self.overwrites}"
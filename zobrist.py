@@ -0,0 +1,42 @@
+import random
+import bitboard
+
+# fixed seed so keys are identical across processes and runs
+_randomizer = random.Random(0x5EED)
+
+
+def _random_key():
+    return _randomizer.getrandbits(64)
+
+
+PIECE_KEYS = {piece: [_random_key() for _ in range(64)] for piece in bitboard.PIECE_CHARACTERS}
+PIECE_KEYS[None] = [0] * 64
+SIDE_KEY = _random_key()
+# white short, white long, black short, black long
+CASTLING_KEYS = [_random_key() for _ in range(4)]
+# en passant target file for the side that may take
+EN_PASSANT_KEYS = [[_random_key() for _ in range(8)] for _ in (bitboard.WHITE, bitboard.BLACK)]
+
+
+def get_piece_key(piece, index):
+    return PIECE_KEYS[piece][index]
+
+
+def compute_piece_key(configuration):
+    key = 0
+    for square, piece in configuration.items():
+        if piece is not None:
+            key ^= PIECE_KEYS[piece][bitboard.SQUARE_INDEX[square]]
+    return key
+
+
+def get_state_key(is_dark_to_move, castling_rights, white_en_passant_target_file, black_en_passant_target_file):
+    key = SIDE_KEY if is_dark_to_move else 0
+    for index, castling_right in enumerate(castling_rights):
+        if castling_right:
+            key ^= CASTLING_KEYS[index]
+    if white_en_passant_target_file is not None:
+        key ^= EN_PASSANT_KEYS[bitboard.WHITE][white_en_passant_target_file]
+    if black_en_passant_target_file is not None:
+        key ^= EN_PASSANT_KEYS[bitboard.BLACK][black_en_passant_target_file]
+    return key